@@ -1,6 +1,7 @@
 import logging
 
-from fastapi import APIRouter, HTTPException, status, UploadFile
+from fastapi import APIRouter, Body, HTTPException, Query, status, UploadFile
+from fastapi.responses import ORJSONResponse
 
 from app.loader import (
     init_project,
@@ -9,21 +10,49 @@ from app.loader import (
     drop_table_by_name,
     load_table_from_file,
     UploadableTable,
+    UploadTooLargeError,
     export_table,
+    FileFormat,
+    LevelingObjective,
     compute_cpm,
     compute_rcpm,
     compute_ssgs,
     compute_rcpm_with_local_sgs,
+    compute_reschedule,
+    compute_genetic,
+    compute_scenarios,
+    get_schedule_versions,
+    get_results_page,
+    ResultField,
+    get_schedule_diff,
     get_completion_percentage,
     get_gantt_chart,
     get_gantt_with_resource_chart,
     detect_delays,
+    get_risk_analysis,
+    get_resource_usage,
+    get_capacity_sweep,
+)
+from app.metrics import collect_spans
+from app.models import ScenarioBatch
+from logic.src.algorithms import InvalidProjectError
+from logic.src.analytics import UnknownDistributionError, UnknownResourceError
+from logic.src.database import (
+    NotEmptyDBError,
+    IncompatibleColumnsError,
+    InvalidRowsError,
 )
-from logic.src.database import NotEmptyDBError, IncompatibleColumnsError
 
 
 log = logging.getLogger("uvicorn")
 
+
+def with_timings(response: dict, spans: list[dict], timings: bool) -> dict:
+    if timings:
+        response["timings"] = spans
+    return response
+
+
 project_router = APIRouter()
 
 
@@ -65,14 +94,29 @@ tables_router = APIRouter()
 @tables_router.post("/upload/", status_code=status.HTTP_201_CREATED)
 async def upload_table(file: UploadFile, table_name: UploadableTable):
     try:
-        load_table_from_file(file, table_name)
-        return {"message": f"The table {table_name} has been uploaded successfully."}
+        rows = load_table_from_file(file, table_name)
+        return {
+            "message": f"The table {table_name} has been uploaded successfully.",
+            "rows": rows,
+        }
+    except UploadTooLargeError as e:
+        log.error(f"Upload is too large: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e),
+        )
     except IncompatibleColumnsError as e:
         log.error(f"Columns are incompatible: {e}")
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Columns are incompatible",
         )
+    except (InvalidRowsError, InvalidProjectError) as e:
+        log.error(f"Invalid project data: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=e.errors,
+        )
     except Exception as e:
         log.error(f"Error while uploading the table {table_name}: {e}")
         raise HTTPException(
@@ -82,9 +126,11 @@ async def upload_table(file: UploadFile, table_name: UploadableTable):
 
 
 @tables_router.get("/export/", status_code=status.HTTP_200_OK)
-async def export_table_to_csv(table_name: Table):
+async def export_table_to_csv(
+    table_name: Table, file_format: FileFormat = FileFormat.csv
+):
     try:
-        output_file = export_table(table_name)
+        output_file = export_table(table_name, file_format)
         return {"download_link": output_file}
     except Exception as e:
         log.error(f"Error while exporting the table {table_name}: {e}")
@@ -109,12 +155,31 @@ async def delete_table(table_name: Table):
 
 planning_router = APIRouter()
 
+# Расчетные обработчики - обычные функции: FastAPI выполняет их в пуле потоков,
+# и долгие вычисления не блокируют цикл событий для остальных запросов
+
 
 @planning_router.put("/cpm/", status_code=status.HTTP_200_OK)
-async def calculate_cpm():
+def calculate_cpm(
+    reduce_graph: bool = False,
+    decompose: bool = False,
+    workers: int | None = Query(None, ge=1),
+    level: LevelingObjective | None = None,
+    level_time_limit: float = Query(1.0, gt=0),
+    timings: bool = False,
+):
     try:
-        result, duration = compute_cpm()
-        return {"critical_path": result, "duration": duration}
+        with collect_spans() as spans:
+            response = compute_cpm(
+                reduce_graph, decompose, workers, level, level_time_limit
+            )
+        return with_timings(response, spans, timings)
+    except InvalidProjectError as e:
+        log.error(f"Invalid project data: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=e.errors,
+        )
     except Exception as e:
         log.error(f"Error while calculating CPM: {e}")
         raise HTTPException(
@@ -124,10 +189,34 @@ async def calculate_cpm():
 
 
 @planning_router.put("/rcpm/", status_code=status.HTTP_200_OK)
-async def calculate_rcpm():
+def calculate_rcpm(
+    justify: bool = False,
+    justify_time_limit: float = Query(1.0, gt=0),
+    reduce_graph: bool = False,
+    decompose: bool = False,
+    workers: int | None = Query(None, ge=1),
+    level: LevelingObjective | None = None,
+    level_time_limit: float = Query(1.0, gt=0),
+    timings: bool = False,
+):
     try:
-        result, duration = compute_rcpm()
-        return {"critical_path": result, "duration": duration}
+        with collect_spans() as spans:
+            response = compute_rcpm(
+                justify,
+                justify_time_limit,
+                reduce_graph,
+                decompose,
+                workers,
+                level,
+                level_time_limit,
+            )
+        return with_timings(response, spans, timings)
+    except InvalidProjectError as e:
+        log.error(f"Invalid project data: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=e.errors,
+        )
     except Exception as e:
         log.error(f"Error while calculating RCPM: {e}")
         raise HTTPException(
@@ -137,10 +226,34 @@ async def calculate_rcpm():
 
 
 @planning_router.put("/ssgs/", status_code=status.HTTP_200_OK)
-async def calculate_ssgs():
+def calculate_ssgs(
+    justify: bool = False,
+    justify_time_limit: float = Query(1.0, gt=0),
+    reduce_graph: bool = False,
+    decompose: bool = False,
+    workers: int | None = Query(None, ge=1),
+    level: LevelingObjective | None = None,
+    level_time_limit: float = Query(1.0, gt=0),
+    timings: bool = False,
+):
     try:
-        result, duration = compute_ssgs()
-        return {"critical_path": result, "duration": duration}
+        with collect_spans() as spans:
+            response = compute_ssgs(
+                justify,
+                justify_time_limit,
+                reduce_graph,
+                decompose,
+                workers,
+                level,
+                level_time_limit,
+            )
+        return with_timings(response, spans, timings)
+    except InvalidProjectError as e:
+        log.error(f"Invalid project data: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=e.errors,
+        )
     except Exception as e:
         log.error(f"Error while calculating SSGS: {e}")
         raise HTTPException(
@@ -150,10 +263,36 @@ async def calculate_ssgs():
 
 
 @planning_router.put("/rcpm_with_local_sgs/", status_code=status.HTTP_200_OK)
-async def calculate_rcpm_with_local_sgs(selected_tasks: list[str], use_pr: bool):
+def calculate_rcpm_with_local_sgs(
+    selected_tasks: list[str],
+    use_pr: bool,
+    justify: bool = False,
+    justify_time_limit: float = Query(1.0, gt=0),
+    reduce_graph: bool = False,
+    window_start: int | None = None,
+    window_end: int | None = None,
+    timings: bool = False,
+):
     try:
-        result, duration = compute_rcpm_with_local_sgs(selected_tasks, use_pr)
-        return {"critical_path": result, "duration": duration}
+        with collect_spans() as spans:
+            window = None
+            if window_start is not None and window_end is not None:
+                window = (window_start, window_end)
+            response = compute_rcpm_with_local_sgs(
+                selected_tasks,
+                use_pr,
+                justify,
+                justify_time_limit,
+                reduce_graph,
+                window,
+            )
+        return with_timings(response, spans, timings)
+    except InvalidProjectError as e:
+        log.error(f"Invalid project data: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=e.errors,
+        )
     except Exception as e:
         log.error(f"Error while calculating RCPM with local SGS: {e}")
         raise HTTPException(
@@ -162,10 +301,103 @@ async def calculate_rcpm_with_local_sgs(selected_tasks: list[str], use_pr: bool)
         )
 
 
+@planning_router.put("/genetic/", status_code=status.HTTP_200_OK)
+def calculate_genetic(
+    population_size: int = Query(40, ge=2),
+    generations: int = Query(200, ge=0),
+    mutation_rate: float = Query(0.05, ge=0, le=1),
+    time_limit: float = Query(60.0, gt=0),
+    seed: int | None = None,
+    workers: int | None = Query(None, ge=1),
+    reduce_graph: bool = False,
+    timings: bool = False,
+):
+    try:
+        with collect_spans() as spans:
+            response = compute_genetic(
+                population_size,
+                generations,
+                mutation_rate,
+                time_limit,
+                seed,
+                workers,
+                reduce_graph,
+            )
+        return with_timings(response, spans, timings)
+    except InvalidProjectError as e:
+        log.error(f"Invalid project data: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=e.errors,
+        )
+    except Exception as e:
+        log.error(f"Error while running the genetic algorithm: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Internal Server Error: {e}",
+        )
+
+
+@planning_router.post("/scenarios/", status_code=status.HTTP_200_OK)
+def calculate_scenarios(
+    batch: ScenarioBatch,
+    workers: int | None = Query(None, ge=1),
+    timings: bool = False,
+):
+    try:
+        with collect_spans() as spans:
+            comparison = compute_scenarios(
+                [scenario.model_dump() for scenario in batch.scenarios],
+                batch.algorithm.value,
+                workers,
+            )
+        return with_timings({"scenarios": comparison}, spans, timings)
+    except InvalidProjectError as e:
+        log.error(f"Invalid scenario: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=e.errors,
+        )
+    except Exception as e:
+        log.error(f"Error while evaluating scenarios: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Internal Server Error: {e}",
+        )
+
+
+@planning_router.put("/reschedule/", status_code=status.HTTP_200_OK)
+def calculate_reschedule(
+    use_pr: bool = True,
+    justify: bool = False,
+    justify_time_limit: float = Query(1.0, gt=0),
+    reduce_graph: bool = False,
+    timings: bool = False,
+):
+    try:
+        with collect_spans() as spans:
+            response = compute_reschedule(
+                use_pr, justify, justify_time_limit, reduce_graph
+            )
+        return with_timings(response, spans, timings)
+    except InvalidProjectError as e:
+        log.error(f"Invalid project data: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=e.errors,
+        )
+    except Exception as e:
+        log.error(f"Error while rescheduling the remaining work: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Internal Server Error: {e}",
+        )
+
+
 @planning_router.get("/export-results/", status_code=status.HTTP_200_OK)
-async def export_results():
+async def export_results(file_format: FileFormat = FileFormat.csv):
     try:
-        output_file = export_table(Table.results)
+        output_file = export_table(Table.results, file_format)
         return {"download_link": output_file}
     except Exception as e:
         log.error(f"Error while exporting the results: {e}")
@@ -175,13 +407,74 @@ async def export_results():
         )
 
 
+# Ответ собирается из строк БД и сериализуется orjson напрямую,
+# минуя jsonable_encoder
+@planning_router.get(
+    "/results/", status_code=status.HTTP_200_OK, response_class=ORJSONResponse
+)
+async def schedule_results(
+    after: str | None = None,
+    limit: int = Query(1000, ge=1, le=10000),
+    fields: list[ResultField] | None = Query(None),
+    timings: bool = False,
+):
+    try:
+        with collect_spans() as spans:
+            page = get_results_page(after, limit, fields)
+        return ORJSONResponse(with_timings(page, spans, timings))
+    except Exception as e:
+        log.error(f"Error while reading the schedule: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Internal Server Error: {e}",
+        )
+
+
+@planning_router.get("/versions/", status_code=status.HTTP_200_OK)
+async def schedule_versions():
+    try:
+        return {"versions": get_schedule_versions()}
+    except Exception as e:
+        log.error(f"Error while listing schedule versions: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Internal Server Error: {e}",
+        )
+
+
+@planning_router.get("/versions/diff/", status_code=status.HTTP_200_OK)
+async def schedule_versions_diff(
+    from_version: int = Query(..., ge=1),
+    to_version: int = Query(..., ge=1),
+    timings: bool = False,
+):
+    try:
+        with collect_spans() as spans:
+            response = get_schedule_diff(from_version, to_version)
+        return with_timings(response, spans, timings)
+    except KeyError as e:
+        log.error(f"Unknown schedule version: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e.args[0]),
+        )
+    except Exception as e:
+        log.error(f"Error while comparing schedule versions: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Internal Server Error: {e}",
+        )
+
+
 analytics_router = APIRouter()
 
 
 @analytics_router.get("/completion-percentage/", status_code=status.HTTP_200_OK)
-async def completion_percentage():
+async def completion_percentage(timings: bool = False):
     try:
-        return {"completion_percentage": get_completion_percentage()}
+        with collect_spans() as spans:
+            response = {"completion_percentage": get_completion_percentage()}
+        return with_timings(response, spans, timings)
     except Exception as e:
         log.error(f"Error while calculating completion percentage: {e}")
         raise HTTPException(
@@ -191,9 +484,11 @@ async def completion_percentage():
 
 
 @analytics_router.get("/gantt-chart/", status_code=status.HTTP_200_OK)
-async def gantt_chart():
+def gantt_chart(timings: bool = False):
     try:
-        return {"download_link": get_gantt_chart()}
+        with collect_spans() as spans:
+            response = {"download_link": get_gantt_chart()}
+        return with_timings(response, spans, timings)
     except Exception as e:
         log.error(f"Error while generating the Gantt chart: {e}")
         raise HTTPException(
@@ -203,9 +498,11 @@ async def gantt_chart():
 
 
 @analytics_router.get("/gantt-chart-with-resources/", status_code=status.HTTP_200_OK)
-async def gantt_chart_with_resources():
+def gantt_chart_with_resources(timings: bool = False):
     try:
-        return {"download_link": get_gantt_with_resource_chart()}
+        with collect_spans() as spans:
+            response = {"download_link": get_gantt_with_resource_chart()}
+        return with_timings(response, spans, timings)
     except Exception as e:
         log.error(f"Error while generating the Gantt chart with resources: {e}")
         raise HTTPException(
@@ -215,12 +512,99 @@ async def gantt_chart_with_resources():
 
 
 @analytics_router.get("/detect-delays/", status_code=status.HTTP_200_OK)
-async def delays():
+async def delays(timings: bool = False):
     try:
-        return {"delays": detect_delays()}
+        with collect_spans() as spans:
+            response = {"delays": detect_delays()}
+        return with_timings(response, spans, timings)
     except Exception as e:
         log.error(f"Error while detecting delays: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Internal Server Error: {e}",
         )
+
+
+@analytics_router.get("/risk/", status_code=status.HTTP_200_OK)
+def risk_analysis(
+    n_samples: int = Query(1000, ge=1, le=1_000_000),
+    seed: int | None = None,
+    chunk_size: int = Query(500, ge=1, le=5000),
+    timings: bool = False,
+):
+    try:
+        with collect_spans() as spans:
+            response = get_risk_analysis(n_samples, seed, chunk_size)
+        return with_timings(response, spans, timings)
+    except UnknownDistributionError as e:
+        log.error(f"Unknown duration distribution: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    except InvalidProjectError as e:
+        log.error(f"Invalid project data: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=e.errors,
+        )
+    except Exception as e:
+        log.error(f"Error while running the risk analysis: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Internal Server Error: {e}",
+        )
+
+
+@analytics_router.get("/resource-usage/", status_code=status.HTTP_200_OK)
+async def resource_usage(
+    start: int = Query(..., ge=0),
+    end: int = Query(..., gt=0),
+    resource: list[str] | None = Query(None),
+    timings: bool = False,
+):
+    if end <= start:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="The end of the range must be after its start.",
+        )
+    try:
+        with collect_spans() as spans:
+            response = get_resource_usage(start, end, resource)
+        return with_timings(response, spans, timings)
+    except UnknownResourceError as e:
+        log.error(f"Unknown resource: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e),
+        )
+    except Exception as e:
+        log.error(f"Error while computing the resource usage: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Internal Server Error: {e}",
+        )
+
+
+@analytics_router.post("/capacity-sweep/", status_code=status.HTTP_200_OK)
+def capacity_sensitivity(
+    grid: dict[str, list[int]] = Body(..., examples=[{"RES1": [1, 2, 3, 4, 5]}]),
+    workers: int | None = Query(None, ge=1),
+    timings: bool = False,
+):
+    try:
+        with collect_spans() as spans:
+            response = {"curve": get_capacity_sweep(grid, workers)}
+        return with_timings(response, spans, timings)
+    except InvalidProjectError as e:
+        log.error(f"Invalid capacity grid: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=e.errors,
+        )
+    except Exception as e:
+        log.error(f"Error while running the capacity sweep: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Internal Server Error: {e}",
+        )
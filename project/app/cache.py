@@ -0,0 +1,42 @@
+from collections import defaultdict
+from threading import Lock
+
+
+# Кэш прочитанных таблиц и разобранной сети работ в памяти процесса.
+# Запись действительна, пока не изменились счетчики версий таблиц, из которых
+# она построена: их увеличивают загрузка и удаление таблиц и запись результатов.
+# Очистка проекта сбрасывает весь кэш
+class ProjectCache:
+    def __init__(self):
+        self._generation = 0
+        self._versions = defaultdict(int)
+        self._entries = {}
+        self._lock = Lock()
+
+    def _stamp(self, tables) -> tuple:
+        return self._generation, tuple(self._versions[table] for table in tables)
+
+    def invalidate(self, *tables) -> None:
+        with self._lock:
+            if not tables:
+                self._generation += 1
+                self._entries.clear()
+            for table in tables:
+                self._versions[table] += 1
+
+    def get(self, key, tables, load):
+        with self._lock:
+            stamp = self._stamp(tables)
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == stamp:
+                return entry[1]
+
+        value = load()
+        with self._lock:
+            # Пока данные читались, таблицы могли измениться
+            if self._stamp(tables) == stamp:
+                self._entries[key] = (stamp, value)
+        return value
+
+
+project_cache = ProjectCache()
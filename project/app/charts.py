@@ -0,0 +1,78 @@
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from threading import Lock
+
+from app.config import get_settings
+
+_executor = None
+_pending = {}
+_lock = Lock()
+
+
+# Имя файла графика - хэш вида графика и версий данных, из которых он построен:
+# одинаковые запросы получают готовый файл, разные никогда не пишут в один
+def chart_path(kind: str, key: dict) -> str:
+    payload = json.dumps([kind, key], sort_keys=True, default=str)
+    digest = hashlib.sha256(payload.encode()).hexdigest()[:16]
+    return os.path.join(get_settings().static_dir, f"{kind}_{digest}.png")
+
+
+# pyplot не потокобезопасен, поэтому графики строятся в отдельных процессах.
+# spawn: процессы не наследуют потоки и состояние сервера
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=get_settings().chart_workers,
+                mp_context=get_context("spawn"),
+            )
+        return _executor
+
+
+# Файл пишется во временный и переименовывается, поэтому читатели
+# не видят недописанный график
+def _render(function_name: str, args: tuple, path: str) -> None:
+    from logic.src import plot
+
+    root, extension = os.path.splitext(path)
+    tmp_path = f"{root}.{os.getpid()}.tmp{extension}"
+    getattr(plot, function_name)(*args, tmp_path)
+    os.replace(tmp_path, path)
+
+
+def _forget(path: str) -> None:
+    with _lock:
+        _pending.pop(path, None)
+
+
+# Данные читаются только если графика еще нет. Одновременные запросы
+# одного графика ждут одну и ту же задачу пула
+def render_chart(path: str, function_name: str, load) -> str:
+    if os.path.exists(path):
+        return path
+
+    executor = _get_executor()
+    with _lock:
+        future = _pending.get(path)
+    if future is None:
+        args = load()
+        with _lock:
+            future = _pending.get(path)
+            if future is None:
+                future = executor.submit(_render, function_name, args, path)
+                _pending[path] = future
+                future.add_done_callback(lambda _: _forget(path))
+    future.result()
+    return path
+
+
+def shutdown_chart_pool() -> None:
+    global _executor
+    with _lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(cancel_futures=True)
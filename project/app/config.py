@@ -10,6 +10,11 @@ log = logging.getLogger("uvicorn")
 class Settings(BaseSettings):
     environment: str = "dev"
     static_dir: str = "static/"
+    project_cache: bool = True
+    max_upload_size: int = 256 * 1024 * 1024
+    chart_workers: int = 2
+    # Каталог, через который воркеры gunicorn складывают метрики; None - один процесс
+    metrics_dir: str | None = None
     db_host: str
     db_port: int
     db_user: str
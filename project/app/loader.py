@@ -1,3 +1,5 @@
+import io
+import logging
 import os
 import psycopg2
 from contextlib import contextmanager
@@ -6,41 +8,76 @@ from enum import Enum
 from fastapi import UploadFile
 import pandas as pd
 
+from app.cache import project_cache
+from app.charts import chart_path, render_chart
 from app.config import get_settings
+from app.metrics import timed
 from logic.src.database import (
     create_tables,
     drop_all_tables,
     drop_table,
-    insert_from_csv,
+    insert_from_stream,
+    insert_from_parquet,
+    export_table_to_parquet,
     export_table_to_csv,
     insert_results_to_table,
+    list_schedule_versions,
+    schedule_diff,
+    latest_version,
+    results_page,
 )
 from logic.src.algorithms import (
     cpm,
     rcpm,
     ssgs,
     prepare_operations,
+    copy_operations,
     check_resource_conflicts,
     check_precedence_relations,
+    check_time_windows,
     local_ssgs,
+    select_tasks,
+    downstream_region,
+    reschedule,
+    justify,
+    genetic_algorithm,
+    lower_bounds,
+    optimality_gap,
+    validate_operations,
+    validate_resources,
+    transitive_reduction,
+    parallel_cpm,
+    parallel_schedule,
+    evaluate_scenarios,
+    capacity_sweep,
+    resource_capacities,
+    level_resources,
 )
 from logic.src.analytics import (
     calculate_completion_percentage,
     detect_project_delays,
+    completion_percentage_query,
+    project_delays_query,
+    monte_carlo_risk,
+    build_usage_index,
+    usage_index_from_results,
+    resource_usage,
 )
-from logic.src.plot import plot_gantt_chart, plot_gantt_and_resource_chart
+
+log = logging.getLogger("uvicorn")
 
 
 @contextmanager
 def db_connection():
     settings = get_settings()
-    conn = psycopg2.connect(
-        host=settings.db_host,
-        dbname=settings.db_name,
-        user=settings.db_user,
-        password=settings.db_password,
-        port=settings.db_port,
-    )
+    with timed("db_connect"):
+        conn = psycopg2.connect(
+            host=settings.db_host,
+            dbname=settings.db_name,
+            user=settings.db_user,
+            password=settings.db_password,
+            port=settings.db_port,
+        )
     conn.autocommit = True
     try:
         yield conn
@@ -75,6 +112,7 @@ def clear_static_dir():
 def clear_project():
     with db_cursor() as cur:
         drop_all_tables(cur)
+    project_cache.invalidate()
 
     clear_static_dir()
 
@@ -87,122 +125,602 @@ class Table(str, Enum):
     results = "results"
 
 
+class FileFormat(str, Enum):
+    csv = "csv"
+    parquet = "parquet"
+
+
 def drop_table_by_name(table_name: Table):
     with db_cursor() as cur:
         drop_table(cur, table_name.value)
+    project_cache.invalidate(table_name.value)
 
 
-def save_file(file: UploadFile) -> str:
-    static_dir = get_settings().static_dir
-    file_path = os.path.join(static_dir, file.filename)
-    with open(file_path, "wb") as buffer:
-        buffer.write(file.file.read())
+class UploadTooLargeError(Exception):
+    pass
+
+
+# Чтение загружаемого файла с ограничением размера: файл читается кусками
+# по мере загрузки в БД и целиком в памяти не держится
+class LimitedReader(io.RawIOBase):
+    def __init__(self, raw, limit: int):
+        self.raw = raw
+        self.limit = limit
+        self.size = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        data = self.raw.read(len(buffer))
+        self.size += len(data)
+        if self.size > self.limit:
+            raise UploadTooLargeError(
+                f"The uploaded file exceeds the limit of {self.limit} bytes."
+            )
+        buffer[: len(data)] = data
+        return len(data)
+
 
-    return file_path
+def check_upload_size(file: UploadFile, size: int | None) -> int:
+    limit = get_settings().max_upload_size
+    if size is not None and size > limit:
+        raise UploadTooLargeError(
+            f"The uploaded file exceeds the limit of {limit} bytes."
+        )
+    return limit
+
+
+def upload_format(file: UploadFile) -> FileFormat:
+    if (file.filename or "").lower().endswith(".parquet"):
+        return FileFormat.parquet
+    return FileFormat.csv
+
+
+def upload_stream(file: UploadFile) -> io.TextIOWrapper:
+    limit = check_upload_size(file, file.size)
+    return io.TextIOWrapper(
+        io.BufferedReader(LimitedReader(file.file, limit)),
+        encoding="utf-8-sig",
+        newline="",
+    )
 
 
 class UploadableTable(str, Enum):
     operations = "operations"
     resources = "resources"
+    current_status = "current_status"
 
 
-def load_table_from_file(file: UploadFile, table_name: UploadableTable):
-    file_path = save_file(file)
-    with db_cursor() as cur:
-        insert_from_csv(cur, file_path, table_name.value)
+def fetch_resource_types(cur) -> list[str] | None:
+    cur.execute("SELECT type FROM resources")
+    resource_types = [row[0] for row in cur.fetchall()]
+    # Пока ресурсы не загружены, ссылки на них не проверяются
+    return resource_types or None
 
 
-def export_table(table_name: Table) -> str:
-    with db_connection() as conn:
-        result_path = os.path.join(get_settings().static_dir, f"{table_name.value}.csv")
-        export_table_to_csv(conn, table_name.value, result_path)
+# Проверка сети выполняется по уже загруженной, но не зафиксированной таблице
+def validate_upload(conn, cur, table_name: UploadableTable) -> None:
+    with timed(f"validate_{table_name.value}"):
+        if table_name == UploadableTable.operations:
+            df_operations = _read_table(conn, "operations")
+            validate_operations(df_operations, fetch_resource_types(cur))
+        elif table_name == UploadableTable.resources:
+            validate_resources(_read_table(conn, "resources"))
+
+
+# Parquet читается с произвольным доступом (метаданные в конце файла),
+# поэтому размер проверяется до чтения
+def insert_upload(cur, file: UploadFile, table_name: UploadableTable) -> int:
+    if upload_format(file) == FileFormat.parquet:
+        file.file.seek(0, os.SEEK_END)
+        check_upload_size(file, file.file.tell())
+        file.file.seek(0)
+        return insert_from_parquet(cur, file.file, table_name.value)
+    return insert_from_stream(cur, upload_stream(file), table_name.value)
+
+
+def load_table_from_file(file: UploadFile, table_name: UploadableTable) -> int:
+    with db_connection() as conn, conn.cursor() as cur:
+        cur.execute("BEGIN")
+        try:
+            with timed(f"db_copy_{table_name.value}"):
+                rows = insert_upload(cur, file, table_name)
+            validate_upload(conn, cur, table_name)
+        except Exception:
+            cur.execute("ROLLBACK")
+            raise
+        cur.execute("COMMIT")
+    project_cache.invalidate(table_name.value)
+    log.info(f"{rows} rows uploaded into the table {table_name.value}")
+    return rows
+
+
+def export_table(table_name: Table, file_format: FileFormat = FileFormat.csv) -> str:
+    with db_connection() as conn, timed(f"db_export_{table_name.value}"):
+        result_path = os.path.join(
+            get_settings().static_dir, f"{table_name.value}.{file_format.value}"
+        )
+        if file_format == FileFormat.parquet:
+            export_table_to_parquet(conn, table_name.value, result_path)
+        else:
+            export_table_to_csv(conn, table_name.value, result_path)
 
     return result_path
 
 
-def compute_cpm() -> tuple[list[str], int]:
-    with db_connection() as conn:
-        df_operations = pd.read_sql("SELECT * FROM operations", conn)
-        operations = prepare_operations(df_operations)
-        critical_path, total_duration = cpm(operations)
-        insert_results_to_table(conn.cursor(), operations)
-    return critical_path, total_duration
+def cached(key, tables, load):
+    if not get_settings().project_cache:
+        return load()
+    return project_cache.get(key, tables, load)
 
 
-def compute_rcpm() -> tuple[list[str], int]:
-    with db_connection() as conn:
-        df_operations = pd.read_sql("SELECT * FROM operations", conn)
-        df_resources = pd.read_sql("SELECT * FROM resources", conn)
+def _read_table(conn, table_name: str) -> pd.DataFrame:
+    with timed(f"db_read_{table_name}"):
+        return pd.read_sql(f"SELECT * FROM {table_name}", conn)
+
+
+# Вызывающий код может изменять таблицу, поэтому из кэша отдается копия
+def read_table(conn, table_name: str) -> pd.DataFrame:
+    df = cached(table_name, [table_name], lambda: _read_table(conn, table_name))
+    return df.copy()
+
+
+def _load_project(conn, with_resources: bool):
+    df_operations = read_table(conn, "operations")
+    df_resources = read_table(conn, "resources") if with_resources else None
+    with timed("validate_operations"):
+        resource_types = list(df_resources["type"]) if with_resources else None
+        validate_operations(df_operations, resource_types)
+    with timed("prepare_operations"):
         operations = prepare_operations(df_operations)
-        critical_path, total_duration = rcpm(operations, df_resources)
+    return operations, df_resources
 
+
+def load_project(conn, with_resources: bool = True):
+    tables = ["operations", "resources"] if with_resources else ["operations"]
+    operations, df_resources = cached(
+        ("project", with_resources), tables, lambda: _load_project(conn, with_resources)
+    )
+    with timed("copy_operations"):
+        operations = copy_operations(operations)
+    return operations, df_resources.copy() if with_resources else None
+
+
+def check_schedule(operations, df_resources) -> None:
+    with timed("check_resource_conflicts"):
         check_resource_conflicts(operations, df_resources)  # Проверка конфликт ресурсов
+    with timed("check_precedence_relations"):
         check_precedence_relations(operations)  # Проверка конфликт предшествования
+    with timed("check_time_windows"):
+        check_time_windows(operations)  # Проверка release_time и deadline
+
+
+# Индекс загрузки ресурсов последней версии расписания
+usage_indexes = {}
 
-        insert_results_to_table(conn.cursor(), operations)
-    return critical_path, total_duration
 
+def store_usage_index(version: int | None, index: dict) -> None:
+    usage_indexes.clear()
+    usage_indexes[version] = index
 
-def compute_ssgs() -> tuple[list[str], int]:
+
+def save_results(conn, operations, algorithm: str | None = None) -> int:
+    try:
+        with timed("db_insert_results"):
+            version = insert_results_to_table(conn.cursor(), operations, algorithm)
+    finally:
+        project_cache.invalidate("results")
+    with timed("build_usage_index"):
+        store_usage_index(version, build_usage_index(operations))
+    return version
+
+
+def reduce_network(operations, reduce_graph: bool) -> int | None:
+    if not reduce_graph:
+        return None
+    with timed("transitive_reduction"):
+        return transitive_reduction(operations)
+
+
+def compute_bounds(operations, df_resources) -> dict:
+    with timed("lower_bounds"):
+        return lower_bounds(operations, df_resources)
+
+
+# Работы из fixed не сдвигаются
+def justify_schedule(
+    operations, df_resources, time_limit: float, bounds: dict, fixed=()
+) -> int:
+    with timed("justify"):
+        total_duration, _ = justify(
+            operations,
+            df_resources,
+            fixed=fixed,
+            time_limit=time_limit,
+            lower_bound=bounds["lower_bound"],
+        )
+    return total_duration
+
+
+class LevelingObjective(str, Enum):
+    peak = "peak"
+    variance = "variance"
+
+
+# Выравнивание загрузки ресурсов в пределах резервов работ; длительность не меняется
+def level_schedule(
+    operations,
+    df_resources,
+    objective: LevelingObjective | None,
+    time_limit: float,
+) -> dict | None:
+    if objective is None:
+        return None
+    with timed("leveling"):
+        return level_resources(
+            operations, df_resources, objective.value, time_limit=time_limit
+        )
+
+
+def schedule_summary(
+    critical_path,
+    total_duration,
+    bounds: dict | None = None,
+    removed_edges: int | None = None,
+    leveling: dict | None = None,
+) -> dict:
+    summary = {"critical_path": critical_path, "duration": total_duration}
+    if bounds is not None:
+        summary["lower_bounds"] = bounds
+        summary["gap"] = optimality_gap(total_duration, bounds["lower_bound"])
+    if removed_edges is not None:
+        summary["removed_edges"] = removed_edges
+    if leveling is not None:
+        summary["leveling"] = leveling
+    return summary
+
+
+def compute_cpm(
+    reduce_graph: bool = False,
+    decompose: bool = False,
+    workers: int | None = None,
+    level: LevelingObjective | None = None,
+    level_time_limit: float = 1.0,
+) -> dict:
     with db_connection() as conn:
-        df_operations = pd.read_sql("SELECT * FROM operations", conn)
-        df_resources = pd.read_sql("SELECT * FROM resources", conn)
-        operations = prepare_operations(df_operations)
-        critical_path, total_duration = ssgs(operations, df_resources)
+        operations, _ = load_project(conn, with_resources=False)
+        removed_edges = reduce_network(operations, reduce_graph)
+        with timed("cpm"):
+            if decompose:
+                critical_path, total_duration = parallel_cpm(operations, workers)
+            else:
+                critical_path, total_duration = cpm(operations)
+        # CPM не учитывает мощности, поэтому и выравнивание идет без них
+        leveling = level_schedule(operations, None, level, level_time_limit)
+        save_results(conn, operations, "cpm")
+
+    # Без ресурсов CPM точен: длина критического пути и есть нижняя оценка
+    bounds = {"critical_path": total_duration, "lower_bound": total_duration}
+    return schedule_summary(
+        critical_path,
+        total_duration,
+        bounds,
+        removed_edges=removed_edges,
+        leveling=leveling,
+    )
 
-        check_resource_conflicts(operations, df_resources)
-        check_precedence_relations(operations)
 
-        insert_results_to_table(conn.cursor(), operations)
-    return critical_path, total_duration
+def compute_rcpm(
+    use_justify: bool = False,
+    time_limit: float = 1.0,
+    reduce_graph: bool = False,
+    decompose: bool = False,
+    workers: int | None = None,
+    level: LevelingObjective | None = None,
+    level_time_limit: float = 1.0,
+) -> dict:
+    with db_connection() as conn:
+        operations, df_resources = load_project(conn)
+        removed_edges = reduce_network(operations, reduce_graph)
+        bounds = compute_bounds(operations, df_resources)
+        with timed("rcpm"):
+            if decompose:
+                critical_path, total_duration = parallel_schedule(
+                    operations, df_resources, "rcpm", workers
+                )
+            else:
+                critical_path, total_duration = rcpm(operations, df_resources)
+        if use_justify:
+            total_duration = justify_schedule(
+                operations, df_resources, time_limit, bounds
+            )
+        leveling = level_schedule(operations, df_resources, level, level_time_limit)
+
+        check_schedule(operations, df_resources)
+        save_results(conn, operations, "rcpm")
+    return schedule_summary(
+        critical_path,
+        total_duration,
+        bounds,
+        removed_edges=removed_edges,
+        leveling=leveling,
+    )
+
+
+def compute_ssgs(
+    use_justify: bool = False,
+    time_limit: float = 1.0,
+    reduce_graph: bool = False,
+    decompose: bool = False,
+    workers: int | None = None,
+    level: LevelingObjective | None = None,
+    level_time_limit: float = 1.0,
+) -> dict:
+    with db_connection() as conn:
+        operations, df_resources = load_project(conn)
+        removed_edges = reduce_network(operations, reduce_graph)
+        bounds = compute_bounds(operations, df_resources)
+        with timed("ssgs"):
+            if decompose:
+                critical_path, total_duration = parallel_schedule(
+                    operations, df_resources, "ssgs", workers
+                )
+            else:
+                critical_path, total_duration = ssgs(operations, df_resources)
+        if use_justify:
+            total_duration = justify_schedule(
+                operations, df_resources, time_limit, bounds
+            )
+        leveling = level_schedule(operations, df_resources, level, level_time_limit)
+
+        check_schedule(operations, df_resources)
+        save_results(conn, operations, "ssgs")
+    return schedule_summary(
+        critical_path,
+        total_duration,
+        bounds,
+        removed_edges=removed_edges,
+        leveling=leveling,
+    )
 
 
 def compute_rcpm_with_local_sgs(
-    selected_tasks: list[str], use_pr: bool
-) -> tuple[list[str], int]:
+    selected_tasks: list[str],
+    use_pr: bool,
+    use_justify: bool = False,
+    time_limit: float = 1.0,
+    reduce_graph: bool = False,
+    window: tuple[int, int] | None = None,
+) -> dict:
     with db_connection() as conn:
-        df_operations = pd.read_sql("SELECT * FROM operations", conn)
-        df_resources = pd.read_sql("SELECT * FROM resources", conn)
-        operations = prepare_operations(df_operations)
-        critical_path, _ = rcpm(operations, df_resources)
-        total_duration = local_ssgs(
-            operations, df_resources, selected_tasks, use_pr=use_pr
+        operations, df_resources = load_project(conn)
+        removed_edges = reduce_network(operations, reduce_graph)
+        bounds = compute_bounds(operations, df_resources)
+        with timed("rcpm"):
+            critical_path, _ = rcpm(operations, df_resources)
+        # Область ремонта: выбранные работы и их потомки; остальное не сдвигается
+        region = downstream_region(
+            operations, select_tasks(operations, selected_tasks, window)
         )
+        with timed("local_ssgs"):
+            total_duration = local_ssgs(
+                operations, df_resources, selected_tasks, use_pr=use_pr, window=window
+            )
+        if use_justify:
+            total_duration = justify_schedule(
+                operations,
+                df_resources,
+                time_limit,
+                bounds,
+                fixed=[act for act in operations if act not in region],
+            )
+
+        check_schedule(operations, df_resources)
+        save_results(conn, operations, "rcpm_with_local_sgs")
+    return schedule_summary(
+        critical_path, total_duration, bounds, removed_edges=removed_edges
+    )
+
+
+def compute_genetic(
+    population_size: int,
+    generations: int,
+    mutation_rate: float,
+    time_limit: float,
+    seed: int | None,
+    workers: int | None,
+    reduce_graph: bool = False,
+) -> dict:
+    with db_connection() as conn:
+        operations, df_resources = load_project(conn)
+        removed_edges = reduce_network(operations, reduce_graph)
+        bounds = compute_bounds(operations, df_resources)
+        with timed("genetic_algorithm"):
+            critical_path, total_duration, convergence = genetic_algorithm(
+                operations,
+                df_resources,
+                population_size=population_size,
+                generations=generations,
+                mutation_rate=mutation_rate,
+                time_limit=time_limit,
+                seed=seed,
+                workers=workers,
+                lower_bound=bounds["lower_bound"],
+            )
+
+        check_schedule(operations, df_resources)
+        save_results(conn, operations, "genetic")
+
+    summary = schedule_summary(
+        critical_path, total_duration, bounds, removed_edges=removed_edges
+    )
+    summary["convergence"] = convergence
+    return summary
 
-        check_resource_conflicts(operations, df_resources)
-        check_precedence_relations(operations)
 
-        insert_results_to_table(conn.cursor(), operations)
-    return critical_path, total_duration
+def compute_scenarios(
+    scenarios: list[dict], algorithm: str, workers: int | None
+) -> list[dict]:
+    with db_connection() as conn:
+        operations, df_resources = load_project(conn)
+    with timed("evaluate_scenarios"):
+        return evaluate_scenarios(
+            operations, df_resources, scenarios, algorithm=algorithm, workers=workers
+        )
+
+
+def compute_reschedule(
+    use_pr: bool,
+    use_justify: bool = False,
+    time_limit: float = 1.0,
+    reduce_graph: bool = False,
+) -> dict:
+    with db_connection() as conn:
+        operations, df_resources = load_project(conn)
+        removed_edges = reduce_network(operations, reduce_graph)
+        df_current_status = read_table(conn, "current_status")
+        df_results = read_table(conn, "results")
+        with timed("reschedule"):
+            critical_path, total_duration = reschedule(
+                operations,
+                df_resources,
+                df_current_status,
+                df_results,
+                use_pr=use_pr,
+                justify=use_justify,
+                time_limit=time_limit,
+            )
+
+        check_schedule(operations, df_resources)
+        save_results(conn, operations, "reschedule")
+
+    # Замороженные по факту работы могут нарушать ограничения,
+    # поэтому нижние оценки для перепланирования не считаются
+    return schedule_summary(critical_path, total_duration, removed_edges=removed_edges)
+
+
+class ResultField(str, Enum):
+    op_id = "op_id"
+    duration = "duration"
+    predecessors = "predecessors"
+    successors = "successors"
+    resources = "resources"
+    early_start = "early_start"
+    early_finish = "early_finish"
+    late_start = "late_start"
+    late_finish = "late_finish"
+    is_critical = "is_critical"
+
+
+def get_results_page(
+    after: str | None, limit: int, fields: list[ResultField] | None
+) -> dict:
+    fields = [field.value for field in fields] if fields else None
+    with db_connection() as conn, conn.cursor() as cur:
+        with timed("db_results_page"):
+            return results_page(cur, after, limit, fields)
+
+
+def get_schedule_versions() -> list[dict]:
+    with db_connection() as conn, conn.cursor() as cur:
+        with timed("db_schedule_versions"):
+            return list_schedule_versions(cur)
+
+
+def get_schedule_diff(from_version: int, to_version: int) -> dict:
+    with db_connection() as conn, conn.cursor() as cur:
+        with timed("db_schedule_diff"):
+            return schedule_diff(cur, from_version, to_version)
 
 
 def get_completion_percentage() -> float:
     with db_connection() as conn:
-        df_current_status = pd.read_sql("SELECT * FROM current_status", conn)
-    return calculate_completion_percentage(df_current_status)
+        try:
+            with conn.cursor() as cur, timed("db_completion_percentage"):
+                return completion_percentage_query(cur)
+        except psycopg2.Error as e:
+            log.warning(f"Falling back to pandas for completion percentage: {e}")
+            df_current_status = read_table(conn, "current_status")
+    with timed("calculate_completion_percentage"):
+        return calculate_completion_percentage(df_current_status)
+
+
+def get_risk_analysis(n_samples: int, seed: int | None, chunk_size: int) -> dict:
+    with db_connection() as conn:
+        operations, _ = load_project(conn, with_resources=False)
+    with timed("monte_carlo_risk"):
+        return monte_carlo_risk(
+            operations, n_samples=n_samples, seed=seed, chunk_size=chunk_size
+        )
+
+
+# Индекс строится при записи расписания; если расписание записал другой
+# процесс, индекс перестраивается по таблице results
+def get_resource_usage(start: int, end: int, resources: list[str] | None) -> dict:
+    with db_connection() as conn:
+        version = results_version(conn)
+        index = usage_indexes.get(version)
+        if index is None:
+            df_results = read_table(conn, "results")
+            with timed("build_usage_index"):
+                index = usage_index_from_results(df_results)
+            store_usage_index(version, index)
+        capacities = resource_capacities(read_table(conn, "resources"))
+    with timed("resource_usage"):
+        report = resource_usage(index, capacities, start, end, resources)
+    return {"version": version, "start": start, "end": end, "resources": report}
+
+
+def get_capacity_sweep(grid: dict[str, list[int]], workers: int | None) -> list[dict]:
+    with db_connection() as conn:
+        operations, df_resources = load_project(conn)
+    with timed("capacity_sweep"):
+        return capacity_sweep(operations, df_resources, grid, workers=workers)
+
+
+# Версия results - последняя сохраненная версия расписания
+def results_version(conn) -> int | None:
+    with conn.cursor() as cur:
+        return latest_version(cur)
 
 
 def get_gantt_chart() -> str:
-    result_path = os.path.join(get_settings().static_dir, "gantt_chart.png")
     with db_connection() as conn:
-        df_results = pd.read_sql("SELECT * FROM results", conn)
-    plot_gantt_chart(df_results, result_path)
-    return result_path
+        result_path = chart_path("gantt_chart", {"results": results_version(conn)})
+        with timed("plot_gantt_chart"):
+            return render_chart(
+                result_path,
+                "plot_gantt_chart",
+                lambda: (read_table(conn, "results"),),
+            )
 
 
 def get_gantt_with_resource_chart() -> str:
-    result_path = os.path.join(
-        get_settings().static_dir, "gantt_with_resource_chart.png"
-    )
     with db_connection() as conn:
-        df_results = pd.read_sql("SELECT * FROM results", conn)
-        df_resources = pd.read_sql("SELECT * FROM resources", conn)
-    plot_gantt_and_resource_chart(df_results, df_resources, result_path)
-    return result_path
+        # Мощности ресурсов не версионируются, поэтому входят в ключ целиком
+        df_resources = read_table(conn, "resources")
+        key = {
+            "results": results_version(conn),
+            "resources": df_resources.to_dict("list"),
+        }
+        result_path = chart_path("gantt_with_resource_chart", key)
+        with timed("plot_gantt_and_resource_chart"):
+            return render_chart(
+                result_path,
+                "plot_gantt_and_resource_chart",
+                lambda: (read_table(conn, "results"), df_resources),
+            )
 
 
 def detect_delays() -> str:
     with db_connection() as conn:
-        df_results = pd.read_sql("SELECT * FROM results", conn)
-        df_current_status = pd.read_sql("SELECT * FROM current_status", conn)
-    return detect_project_delays(df_results, df_current_status)
+        try:
+            with conn.cursor() as cur, timed("db_detect_delays"):
+                return project_delays_query(cur)
+        except psycopg2.Error as e:
+            log.warning(f"Falling back to pandas for delay detection: {e}")
+            df_results = read_table(conn, "results")
+            df_current_status = read_table(conn, "current_status")
+    with timed("detect_project_delays"):
+        return detect_project_delays(df_results, df_current_status)
@@ -1,10 +1,13 @@
 import logging
 
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 
 from app.api import project_router, tables_router, planning_router, analytics_router
+from app.charts import shutdown_chart_pool
 from app.config import get_settings
+from app.metrics import render_metrics
 
 log = logging.getLogger("uvicorn")
 
@@ -28,6 +31,11 @@ def create_application() -> FastAPI:
 app = create_application()
 
 
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    return render_metrics()
+
+
 @app.on_event("startup")
 async def startup_event():
     log.info("Starting up...")
@@ -36,3 +44,4 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     log.info("Shutting down...")
+    shutdown_chart_pool()
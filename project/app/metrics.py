@@ -0,0 +1,162 @@
+import glob
+import json
+import os
+import time
+import uuid
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock
+
+from app.config import get_settings
+
+# Границы бакетов гистограммы в секундах
+BUCKETS = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+_spans: ContextVar[list | None] = ContextVar("spans", default=None)
+
+
+# Гистограмма живет в памяти процесса. Если задан каталог (metrics_dir),
+# каждый процесс после наблюдения записывает туда свои ряды, а render
+# суммирует файлы всех процессов, в том числе завершившихся
+class Histogram:
+    def __init__(self, name: str, description: str, buckets=BUCKETS, directory=None):
+        self.name = name
+        self.description = description
+        self.buckets = buckets
+        self.directory = directory
+        self._series = {}
+        self._lock = Lock()
+        self._pid = None
+        self._path = None
+
+    def _get_directory(self) -> str | None:
+        if callable(self.directory):
+            return self.directory()
+        return self.directory
+
+    # Ряды, унаследованные через fork, принадлежат родителю: у нового процесса
+    # свой файл и пустые ряды
+    def _check_process(self, directory) -> None:
+        if self._pid == os.getpid():
+            return
+        if self._pid is not None:
+            self._series = {}
+        self._pid = os.getpid()
+        self._path = os.path.join(
+            directory, f"{self.name}_{self._pid}_{uuid.uuid4().hex[:8]}.json"
+        )
+
+    def _dump(self) -> None:
+        tmp_path = f"{self._path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self._series, f)
+        os.replace(tmp_path, self._path)
+
+    def observe(self, label: str, value: float) -> None:
+        directory = self._get_directory()
+        with self._lock:
+            if directory:
+                self._check_process(directory)
+            counts, total = self._series.get(
+                label, ([0] * (len(self.buckets) + 1), 0.0)
+            )
+            counts[bisect_left(self.buckets, value)] += 1
+            self._series[label] = (counts, total + value)
+            if directory:
+                self._dump()
+
+    def _collect(self) -> dict:
+        directory = self._get_directory()
+        if not directory:
+            with self._lock:
+                return {label: (list(c), s) for label, (c, s) in self._series.items()}
+
+        series = {}
+        for path in glob.glob(os.path.join(directory, f"{self.name}_*.json")):
+            try:
+                with open(path) as f:
+                    process_series = json.load(f)
+            except (OSError, ValueError):
+                continue
+            for label, (counts, total) in process_series.items():
+                merged, merged_total = series.get(label, ([0] * len(counts), 0.0))
+                series[label] = (
+                    [a + b for a, b in zip(merged, counts)],
+                    merged_total + total,
+                )
+        return series
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} histogram",
+        ]
+        series = self._collect()
+        for label, (counts, total) in sorted(series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                lines.append(
+                    f'{self.name}_bucket{{stage="{label}",le="{bound}"}} {cumulative}'
+                )
+            cumulative += counts[-1]
+            lines.append(
+                f'{self.name}_bucket{{stage="{label}",le="+Inf"}} {cumulative}'
+            )
+            lines.append(f'{self.name}_sum{{stage="{label}"}} {total}')
+            lines.append(f'{self.name}_count{{stage="{label}"}} {cumulative}')
+        return lines
+
+
+def _metrics_dir() -> str | None:
+    return get_settings().metrics_dir
+
+
+stage_duration = Histogram(
+    "buildlogic_stage_duration_seconds",
+    "Duration of planning and analytics stages, including DB round trips.",
+    directory=_metrics_dir,
+)
+
+
+@contextmanager
+def timed(stage: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        stage_duration.observe(stage, elapsed)
+        spans = _spans.get()
+        if spans is not None:
+            spans.append({"stage": stage, "seconds": round(elapsed, 6)})
+
+
+@contextmanager
+def collect_spans():
+    spans = []
+    token = _spans.set(spans)
+    try:
+        yield spans
+    finally:
+        _spans.reset(token)
+
+
+def render_metrics() -> str:
+    return "\n".join(stage_duration.render()) + "\n"
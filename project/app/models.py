@@ -0,0 +1,21 @@
+from enum import Enum
+
+from pydantic import BaseModel, Field
+
+
+class ScenarioAlgorithm(str, Enum):
+    cpm = "cpm"
+    rcpm = "rcpm"
+    ssgs = "ssgs"
+
+
+class Scenario(BaseModel):
+    name: str
+    durations: dict[str, int] = Field(default_factory=dict)
+    capacities: dict[str, int] = Field(default_factory=dict)
+    added_links: list[tuple[str, str]] = Field(default_factory=list)
+
+
+class ScenarioBatch(BaseModel):
+    algorithm: ScenarioAlgorithm = ScenarioAlgorithm.ssgs
+    scenarios: list[Scenario]
@@ -0,0 +1,40 @@
+import gc
+import glob
+import multiprocessing
+import os
+import tempfile
+
+# gunicorn -c gunicorn.conf.py app.main:app
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_class = "uvicorn.workers.UvicornWorker"
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 300))
+
+# Кэш проекта живет в памяти одного процесса и не видит загрузок,
+# выполненных другими воркерами. Гистограммы /metrics тоже живут в процессе:
+# с несколькими воркерами каждый пишет свои ряды в общий каталог,
+# и /metrics отдает их сумму
+if workers > 1:
+    os.environ.setdefault("PROJECT_CACHE", "false")
+    os.environ.setdefault("METRICS_DIR", tempfile.mkdtemp(prefix="buildlogic-metrics-"))
+
+
+# Ряды прошлого запуска в заданном каталоге не учитываются
+def on_starting(server):
+    metrics_dir = os.environ.get("METRICS_DIR")
+    if metrics_dir:
+        os.makedirs(metrics_dir, exist_ok=True)
+        for path in glob.glob(os.path.join(metrics_dir, "*.json")):
+            os.remove(path)
+
+
+# Приложение импортируется один раз в мастере, воркеры получают его через fork
+# и делят неизменяемые страницы памяти. Соединения с БД открываются на запрос,
+# поэтому до fork их нет
+preload_app = True
+
+
+# Объекты, созданные при импорте, переносятся в постоянное поколение сборщика
+# мусора: он не трогает их в воркерах, и страницы не копируются при записи
+def when_ready(server):
+    gc.freeze()
@@ -0,0 +1,254 @@
+import argparse
+import contextlib
+import csv
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from src.algorithms import (
+    cpm,
+    rcpm,
+    ssgs,
+    genetic_algorithm,
+    prepare_operations,
+    validate_operations,
+    lower_bounds,
+    optimality_gap,
+)
+
+ALGORITHMS = ["cpm", "rcpm", "ssgs", "genetic"]
+SCHEDULE_COLUMNS = [
+    "op_id",
+    "duration",
+    "early_start",
+    "early_finish",
+    "late_start",
+    "late_finish",
+    "is_critical",
+]
+SUMMARY_COLUMNS = [
+    "project",
+    "algorithm",
+    "operations",
+    "makespan",
+    "lower_bound",
+    "gap",
+    "runtime",
+    "error",
+]
+
+
+# Проекты в каталоге: подкаталоги с operations.csv и resources.csv
+# или файлы PSPLIB (*.sm, один режим выполнения)
+def discover_projects(input_dir) -> list[tuple[str, str]]:
+    projects = []
+    for name in sorted(os.listdir(input_dir)):
+        path = os.path.join(input_dir, name)
+        if os.path.isfile(os.path.join(path, "operations.csv")):
+            projects.append((name, path))
+        elif name.endswith(".sm"):
+            projects.append((name[: -len(".sm")], path))
+    return projects
+
+
+def _section(lines, title) -> list[str]:
+    # Данные начинаются через строку после заголовка раздела
+    start = next(i for i, line in enumerate(lines) if line.startswith(title)) + 2
+    section = []
+    for line in lines[start:]:
+        if line.startswith("*"):
+            break
+        section.append(line)
+    return section
+
+
+# Формат PSPLIB: связи в PRECEDENCE RELATIONS, длительности и потребности
+# в REQUESTS/DURATIONS, мощности в RESOURCEAVAILABILITIES.
+# Потребность q ресурса записывается q упоминаниями ресурса
+def read_psplib(path) -> tuple[pd.DataFrame, pd.DataFrame]:
+    with open(path) as file:
+        lines = [line.strip() for line in file if line.strip()]
+
+    successors = {}
+    for line in _section(lines, "PRECEDENCE RELATIONS"):
+        job, _, count, *succ = line.split()
+        successors[job] = succ[: int(count)]
+
+    predecessors = {job: [] for job in successors}
+    for job, succ in successors.items():
+        for other in succ:
+            predecessors[other].append(job)
+
+    start = next(
+        i for i, line in enumerate(lines) if line.startswith("RESOURCEAVAILABILITIES")
+    )
+    names = lines[start + 1].split()
+    types = [f"{names[i]}{names[i + 1]}" for i in range(0, len(names), 2)]
+    quantities = [int(q) for q in lines[start + 2].split()]
+
+    rows = []
+    for line in _section(lines, "REQUESTS/DURATIONS")[1:]:
+        job, _, duration, *requests = line.split()
+        resources = []
+        for r, q in zip(types, requests):
+            resources += [r] * int(q)
+        rows.append(
+            {
+                "op_id": job,
+                "duration": int(duration),
+                "predecessors": str(predecessors[job]),
+                "successors": str(successors[job]),
+                "resources": str(resources),
+            }
+        )
+
+    df_operations = pd.DataFrame(rows)
+    df_resources = pd.DataFrame({"type": types, "quantity": quantities})
+    return df_operations, df_resources
+
+
+def read_project(path) -> tuple[pd.DataFrame, pd.DataFrame]:
+    if os.path.isfile(path):
+        return read_psplib(path)
+    return (
+        pd.read_csv(os.path.join(path, "operations.csv")),
+        pd.read_csv(os.path.join(path, "resources.csv")),
+    )
+
+
+def schedule(operations, df_resources, algorithm, time_limit, seed, lower_bound):
+    if algorithm == "cpm":
+        return cpm(operations)
+    if algorithm == "rcpm":
+        return rcpm(operations, df_resources)
+    if algorithm == "ssgs":
+        return ssgs(operations, df_resources)
+    critical_path, total_duration, _ = genetic_algorithm(
+        operations,
+        df_resources,
+        time_limit=time_limit,
+        seed=seed,
+        workers=1,
+        lower_bound=lower_bound,
+    )
+    return critical_path, total_duration
+
+
+def write_schedule(operations, output_file) -> None:
+    with open(output_file, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(SCHEDULE_COLUMNS)
+        for op_id, op in operations.items():
+            writer.writerow([op_id] + [op[col] for col in SCHEDULE_COLUMNS[1:]])
+
+
+# Один проект и один алгоритм в процессе пула. Печать алгоритмов
+# подавляется, чтобы не смешивать вывод процессов
+def run_instance(name, path, algorithm, output_dir, time_limit, seed) -> dict:
+    result = dict.fromkeys(SUMMARY_COLUMNS, "")
+    result.update(project=name, algorithm=algorithm)
+    try:
+        df_operations, df_resources = read_project(path)
+        validate_operations(df_operations, list(df_resources["type"]))
+        operations = prepare_operations(df_operations)
+        bounds = lower_bounds(operations, df_resources)
+
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            _, total_duration = schedule(
+                operations,
+                df_resources,
+                algorithm,
+                time_limit,
+                seed,
+                bounds["lower_bound"],
+            )
+        runtime = time.perf_counter() - started
+
+        project_dir = os.path.join(output_dir, name)
+        os.makedirs(project_dir, exist_ok=True)
+        write_schedule(operations, os.path.join(project_dir, f"{algorithm}.csv"))
+
+        lower_bound = bounds["critical_path" if algorithm == "cpm" else "lower_bound"]
+        result.update(
+            operations=len(operations),
+            makespan=int(total_duration),
+            lower_bound=lower_bound,
+            gap=round(optimality_gap(total_duration, lower_bound), 4),
+            runtime=round(runtime, 4),
+        )
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    return result
+
+
+def run_batch(
+    input_dir, output_dir, algorithms, workers=None, time_limit=10.0, seed=None
+) -> list[dict]:
+    projects = discover_projects(input_dir)
+    os.makedirs(output_dir, exist_ok=True)
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(
+                run_instance, name, path, algorithm, output_dir, time_limit, seed
+            )
+            for name, path in projects
+            for algorithm in algorithms
+        ]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            status = result["error"] or f"makespan {result['makespan']}"
+            print(
+                f"[{len(results)}/{len(futures)}] {result['project']} {result['algorithm']}: {status}"
+            )
+
+    results.sort(
+        key=lambda result: (result["project"], ALGORITHMS.index(result["algorithm"]))
+    )
+    with open(os.path.join(output_dir, "summary.csv"), "w", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=SUMMARY_COLUMNS)
+        writer.writeheader()
+        writer.writerows(results)
+    return results
+
+
+def parse_args(args=None):
+    parser = argparse.ArgumentParser(
+        description="Plan every project in a directory without a database."
+    )
+    parser.add_argument(
+        "input_dir", help="directory with project subdirectories or PSPLIB .sm files"
+    )
+    parser.add_argument("output_dir", help="directory for schedules and summary.csv")
+    parser.add_argument(
+        "-a", "--algorithms", nargs="+", choices=ALGORITHMS, default=["ssgs"]
+    )
+    parser.add_argument("-w", "--workers", type=int, default=None)
+    parser.add_argument(
+        "--time-limit",
+        type=float,
+        default=10.0,
+        help="time limit of the genetic algorithm, s",
+    )
+    parser.add_argument("--seed", type=int, default=None)
+    return parser.parse_args(args)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    results = run_batch(
+        args.input_dir,
+        args.output_dir,
+        args.algorithms,
+        workers=args.workers,
+        time_limit=args.time_limit,
+        seed=args.seed,
+    )
+    failed = sum(bool(result["error"]) for result in results)
+    print(f"{len(results) - failed} runs finished, {failed} failed.")
@@ -24,7 +24,7 @@ def calculate_cpm(cur, df_operations):
     critical_path, total_duration = cpm(operations)
     print("Critical Path:", critical_path)
     print("CPM Total Duration of the Project:", total_duration)
-    insert_results_to_table(cur, operations)
+    insert_results_to_table(cur, operations, "cpm")
 
 
 def calculate_rcpm(cur, df_operations, df_resources):
@@ -37,7 +37,7 @@ def calculate_rcpm(cur, df_operations, df_resources):
     check_resource_conflicts(operations, df_resources)  # Проверка конфликт ресурсов
     check_precedence_relations(operations)  # Проверка конфликт предшествоания
 
-    insert_results_to_table(cur, operations)
+    insert_results_to_table(cur, operations, "rcpm")
 
 
 def calculate_ssgs(cur, df_operations, df_resources):
@@ -50,7 +50,7 @@ def calculate_ssgs(cur, df_operations, df_resources):
     check_resource_conflicts(operations, df_resources)
     check_precedence_relations(operations)
 
-    insert_results_to_table(cur, operations)
+    insert_results_to_table(cur, operations, "ssgs")
 
 
 def calculate_rcpm_with_local_sgs(
@@ -67,7 +67,24 @@ def calculate_rcpm_with_local_sgs(
     check_resource_conflicts(operations, df_resources)
     check_precedence_relations(operations)
 
-    insert_results_to_table(cur, operations)
+    insert_results_to_table(cur, operations, "rcpm_with_local_sgs")
+
+
+def calculate_new_schedule_with_work_not_done(
+    cur, df_operations, df_resources, df_current_status, df_results, use_pr=True
+):
+    operations = prepare_operations(df_operations)
+
+    critical_path, total_duration = reschedule(
+        operations, df_resources, df_current_status, df_results, use_pr=use_pr
+    )
+    print("Critical Path:", critical_path)
+    print("Rescheduled Total Duration of the Project:", total_duration)
+
+    check_resource_conflicts(operations, df_resources)
+    check_precedence_relations(operations)
+
+    insert_results_to_table(cur, operations, "reschedule")
 
 
 if __name__ == "__main__":
@@ -198,29 +215,9 @@ Your choice: """)
             detect_project_delays(df_results, df_current_status)
 
         elif act == "5":
-            completed_tasks = df_current_status[df_current_status["is_done"] == True][
-                "op_id"
-            ].tolist()
-            df_operations_filtered = df_operations[
-                ~df_operations["op_id"].isin(completed_tasks)
-            ]
-            print(df_operations_filtered)
-            algo = input("""Select the algorithm: 
-            1 - calculate_cpm, 
-            2 - calculate_rcpm, 
-            3 - calculate_ssgs.
-Your choice: """)
-            if algo == "1":
-                pass
-
-            elif algo == "2":
-                pass
-
-            elif algo == "3":
-                pass
-
-            else:
-                print("Такого алгоритма нет!")
+            calculate_new_schedule_with_work_not_done(
+                cur, df_operations, df_resources, df_current_status, df_results
+            )
         else:
             print("Такого действия нет!")
 
@@ -1,4 +1,16 @@
+from .profile import *
 from .cpm import *
 from .rcpm import *
 from .ssgs import *
 from .utils import *
+from .reschedule import *
+from .justification import *
+from .genetic import *
+from .bounds import *
+from .validation import *
+from .windows import *
+from .reduction import *
+from .components import *
+from .scenarios import *
+from .sensitivity import *
+from .leveling import *
@@ -0,0 +1,66 @@
+from math import ceil
+
+from .profile import resource_demand
+from .utils import resource_capacities, topological_order
+from .windows import release_time
+
+# Ограничение на число работ-кандидатов для дизъюнктивной оценки
+DISJUNCTIVE_CANDIDATES = 500
+
+
+# Длина критического пути без учета ресурсов (прямой проход CPM с release_time)
+def critical_path_bound(operations) -> int:
+    early_finish = {}
+    for act in topological_order(operations):
+        op = operations[act]
+        early_start = max((early_finish[pre] for pre in op['predecessors']), default=0)
+        early_start = max(early_start, release_time(op))
+        early_finish[act] = early_start + op['duration']
+    return max(early_finish.values(), default=0)
+
+
+# Суммарная потребность ресурса / мощность ресурса
+def resource_bound(operations, capacities) -> int:
+    work = {r: 0 for r in capacities}
+    for op in operations.values():
+        for r, q in resource_demand(op['resources']).items():
+            if r in work:
+                work[r] += q * op['duration']
+    return max((ceil(work[r] / capacities[r]) for r in capacities if capacities[r] > 0), default=0)
+
+
+def _incompatible(operations, capacities, a, b) -> bool:
+    if b in operations[a]['predecessors'] or b in operations[a]['successors']:
+        return True
+    demand_a = resource_demand(operations[a]['resources'])
+    demand_b = resource_demand(operations[b]['resources'])
+    return any(demand_a[r] + demand_b[r] > capacities.get(r, 0) for r in demand_a.keys() & demand_b.keys())
+
+
+# Оценка LB3: жадно собранное множество попарно несовместимых работ
+# (связаны предшествованием или не помещаются вместе по ресурсам)
+# не может выполняться параллельно, поэтому сумма их длительностей - нижняя граница
+def disjunctive_bound(operations, capacities) -> int:
+    candidates = sorted(operations, key=lambda act: operations[act]['duration'], reverse=True)
+    clique = []
+    for act in candidates[:DISJUNCTIVE_CANDIDATES]:
+        if all(_incompatible(operations, capacities, act, other) for other in clique):
+            clique.append(act)
+    return sum(operations[act]['duration'] for act in clique)
+
+
+def lower_bounds(operations, df_resources) -> dict:
+    capacities = resource_capacities(df_resources)
+    bounds = {
+        'critical_path': int(critical_path_bound(operations)),
+        'resource': int(resource_bound(operations, capacities)),
+        'disjunctive': int(disjunctive_bound(operations, capacities)),
+    }
+    bounds['lower_bound'] = max(bounds.values())
+    return bounds
+
+
+def optimality_gap(makespan, lower_bound) -> float:
+    if lower_bound <= 0:
+        return 0.0
+    return (makespan - lower_bound) / lower_bound
@@ -0,0 +1,128 @@
+from concurrent.futures import ProcessPoolExecutor
+
+from .cpm import cpm
+from .rcpm import rcpm
+from .ssgs import ssgs
+from .windows import deadline
+
+SCHEDULERS = {'rcpm': rcpm, 'ssgs': ssgs}
+
+
+# Компоненты слабой связности сети работ (обход в ширину)
+def weakly_connected_components(operations) -> list[list]:
+    seen = set()
+    components = []
+    for start in operations:
+        if start in seen:
+            continue
+        seen.add(start)
+        component = [start]
+        for act in component:
+            op = operations[act]
+            for other in (*op['predecessors'], *op['successors']):
+                if other not in seen:
+                    seen.add(other)
+                    component.append(other)
+        components.append(component)
+    return components
+
+
+# Объединение компонент, использующих общие ресурсы (система непересекающихся множеств)
+def resource_groups(operations, components) -> list[list]:
+    parent = list(range(len(components)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    owner = {}
+    for i, component in enumerate(components):
+        for act in component:
+            for r in operations[act]['resources']:
+                if r in owner:
+                    parent[find(i)] = find(owner[r])
+                else:
+                    owner[r] = i
+
+    groups = {}
+    for i, component in enumerate(components):
+        groups.setdefault(find(i), []).extend(component)
+    return list(groups.values())
+
+
+# Внутри части сохраняется исходный порядок работ: от него зависят
+# списки работ SGS при равных приоритетах
+def _split(operations, groups) -> list[dict]:
+    index = {act: i for i, act in enumerate(operations)}
+    return [{act: operations[act] for act in sorted(group, key=index.get)} for group in groups]
+
+
+def _map(function, tasks, workers):
+    if len(tasks) == 1 or workers == 1:
+        return [function(*task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(function, *zip(*tasks)))
+
+
+def _cpm_part(part):
+    _, total_duration = cpm(part)
+    return part, total_duration
+
+
+def _schedule_part(part, df_resources, scheduler, options):
+    critical_path, _ = SCHEDULERS[scheduler](part, df_resources, **options)
+    return part, critical_path
+
+
+def _merge(operations, part) -> None:
+    for act, op in part.items():
+        operations[act].update(op)
+
+
+# CPM по компонентам связности в пуле процессов. Поздние сроки каждой
+# компоненты сдвигаются к общему окончанию проекта, как при CPM всей сети.
+# Сдвиг не учитывает директивные сроки, такие компоненты пересчитываются
+def parallel_cpm(operations, workers=None):
+    parts = _split(operations, weakly_connected_components(operations))
+    results = _map(_cpm_part, [(part,) for part in parts], workers)
+
+    total_duration = max(duration for _, duration in results)
+    for part, duration in results:
+        shift = total_duration - duration
+        if shift and any(deadline(op) for op in part.values()):
+            cpm(part, horizon=total_duration)
+            shift = 0
+        for op in part.values():
+            op['late_start'] += shift
+            op['late_finish'] += shift
+            op['is_critical'] = op['early_start'] == op['late_start']
+        _merge(operations, part)
+
+    critical_path = [act for act, op in operations.items() if op['is_critical']]
+    return critical_path, total_duration
+
+
+# RCPM/SSGS по группам компонент, не делящим ресурсы, в пуле процессов.
+# Части планируются как в сети целиком: поздние сроки - от окончания CPM
+# всей сети, правило приоритета SSGS - по директивным срокам всей сети.
+# CPM всей сети линейна и дешевле SGS, поэтому считается здесь один раз
+def parallel_schedule(operations, df_resources, scheduler='ssgs', workers=None):
+    _, cpm_duration = cpm(operations)
+    options = {'horizon': cpm_duration}
+    if scheduler == 'ssgs':
+        options['use_pr'] = any(deadline(op) for op in operations.values())
+
+    groups = resource_groups(operations, weakly_connected_components(operations))
+    parts = _split(operations, groups)
+    results = _map(_schedule_part, [(part, df_resources, scheduler, options) for part in parts], workers)
+
+    critical = set()
+    for part, critical_path in results:
+        critical.update(critical_path)
+        _merge(operations, part)
+
+    critical_path = [act for act in operations if act in critical]
+    total_duration = max(op['early_finish'] for op in operations.values())
+    return critical_path, total_duration
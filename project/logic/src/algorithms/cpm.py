@@ -1,14 +1,18 @@
 from collections import deque
 
-def cpm(operations):
+from .windows import InfeasibleDeadlineError, deadline, release_time, window_errors
+
+def cpm(operations, horizon=None):
     
-    # Инициализация ранних стартов и финишей
+    # Инициализация ранних стартов и финишей: не раньше release_time
     for operation in operations.values():
-        operation['early_start'] = 0
+        operation['early_start'] = release_time(operation)
         operation['early_finish'] = 0
 
-    # Прямой проход (Forward Pass)
-    queue = deque([op_id for op_id, op in operations.items() if len(op['predecessors']) == 0])
+    # Прямой проход (Forward Pass) в топологическом порядке:
+    # работа обрабатывается один раз, когда обработаны все ее предшественники
+    remaining = {op_id: len(op['predecessors']) for op_id, op in operations.items()}
+    queue = deque([op_id for op_id, count in remaining.items() if count == 0])
 
     while queue:
         op_id = queue.popleft()
@@ -20,17 +24,23 @@ def cpm(operations):
             successor = operations[succ_id]
             successor['early_start'] = max(successor['early_start'], operation['early_finish'])
 
-            queue.append(succ_id)
+            remaining[succ_id] -= 1
+            if remaining[succ_id] == 0:
+                queue.append(succ_id)
 
-    # Инициализация поздних стартов и финишей
+    # Инициализация поздних стартов и финишей: не позже deadline.
+    # horizon - общее окончание, если сеть - часть большего проекта
     max_early_finish = max([op['early_finish'] for op in operations.values()])
+    max_early_finish = max(max_early_finish, horizon or 0)
 
     for operation in operations.values():
-        operation['late_start'] = max_early_finish
-        operation['late_finish'] = max_early_finish
+        late_finish = min(max_early_finish, deadline(operation) or max_early_finish)
+        operation['late_start'] = late_finish
+        operation['late_finish'] = late_finish
 
     # Обратный проход (Backward Pass)
-    queue = deque([op_id for op_id, op in operations.items() if len(op['successors']) == 0])
+    remaining = {op_id: len(op['successors']) for op_id, op in operations.items()}
+    queue = deque([op_id for op_id, count in remaining.items() if count == 0])
 
     while queue:
         op_id = queue.popleft()
@@ -41,8 +51,15 @@ def cpm(operations):
         for pred_id in operation['predecessors']:
             predecessor = operations[pred_id]
             predecessor['late_finish'] = min(predecessor['late_finish'], operation['late_start'])
-            
-            queue.append(pred_id)
+
+            remaining[pred_id] -= 1
+            if remaining[pred_id] == 0:
+                queue.append(pred_id)
+
+    # Окна, сжатые проходами до пустых, - недостижимые сроки
+    errors = window_errors(operations)
+    if errors:
+        raise InfeasibleDeadlineError(errors)
 
     # Определение критического пути
     critical_path = []
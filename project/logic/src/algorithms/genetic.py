@@ -0,0 +1,137 @@
+import random
+import time
+from math import inf
+from multiprocessing import Pool
+
+from .cpm import cpm
+from .profile import ResourceProfile
+from .ssgs import priority_activity_list, serial_sgs
+from .utils import apply_start_times, resource_capacities
+
+# Данные проекта в процессах пула: передаются один раз при старте процесса
+_operations = None
+_capacities = None
+
+
+def _init_worker(operations, capacities) -> None:
+    global _operations, _capacities
+    _operations = operations
+    _capacities = capacities
+
+
+# Декодирование списка работ последовательной схемой SGS
+def decode(operations, capacities, activity_list) -> dict:
+    return serial_sgs(operations, activity_list, ResourceProfile(capacities))
+
+
+def _fitness(activity_list):
+    start_times = decode(_operations, _capacities, activity_list)
+    if len(start_times) < len(activity_list):
+        return inf
+    return max((start + _operations[act]['duration'] for act, start in start_times.items()), default=0)
+
+
+def random_activity_list(operations, rng) -> list:
+    return priority_activity_list(operations, priority={act: rng.random() for act in operations})
+
+
+# Одноточечное скрещивание: префикс матери, остальное в порядке отца.
+# Допустимость по предшествованию сохраняется
+def crossover(mother, father, rng) -> list:
+    point = rng.randrange(1, len(mother)) if len(mother) > 1 else 0
+    head = mother[:point]
+    taken = set(head)
+    return head + [act for act in father if act not in taken]
+
+
+# Мутация: перестановка соседних работ, не связанных предшествованием
+def mutate(activity_list, operations, rate, rng) -> list:
+    activity_list = list(activity_list)
+    for i in range(len(activity_list) - 1):
+        if rng.random() < rate and activity_list[i] not in operations[activity_list[i + 1]]['predecessors']:
+            activity_list[i], activity_list[i + 1] = activity_list[i + 1], activity_list[i]
+    return activity_list
+
+
+def _tournament(population, fitness, rng):
+    i, j = rng.randrange(len(population)), rng.randrange(len(population))
+    return population[i] if fitness[i] <= fitness[j] else population[j]
+
+
+def genetic_algorithm(
+    operations,
+    df_resources,
+    population_size=40,
+    generations=200,
+    mutation_rate=0.05,
+    elite_size=2,
+    time_limit=60.0,
+    seed=None,
+    workers=None,
+    lower_bound=None,
+):
+    critical_path, _ = cpm(operations)
+    capacities = resource_capacities(df_resources)
+    rng = random.Random(seed)
+    started = time.perf_counter()
+
+    # Начальная популяция: правило min LFT и случайные списки
+    population = [priority_activity_list(operations, use_pr=True)]
+    population += [random_activity_list(operations, rng) for _ in range(population_size - 1)]
+    elite_size = min(elite_size, population_size)
+
+    pool = None
+    if workers != 1:
+        pool = Pool(workers, initializer=_init_worker, initargs=(operations, capacities))
+    else:
+        _init_worker(operations, capacities)
+
+    def evaluate(individuals):
+        if pool is None:
+            return [_fitness(individual) for individual in individuals]
+        return pool.map(_fitness, individuals)
+
+    convergence = []
+    try:
+        fitness = evaluate(population)
+        for generation in range(generations + 1):
+            ranked = sorted(range(len(population)), key=fitness.__getitem__)
+            population = [population[i] for i in ranked]
+            fitness = [fitness[i] for i in ranked]
+
+            elapsed = time.perf_counter() - started
+            finite = [value for value in fitness if value < inf]
+            convergence.append(
+                {
+                    "generation": generation,
+                    "best": fitness[0] if fitness[0] < inf else None,
+                    "mean": sum(finite) / len(finite) if finite else None,
+                    "elapsed": round(elapsed, 3),
+                }
+            )
+            if generation == generations or elapsed >= time_limit:
+                break
+            # Оптимум доказан: расписание достигло нижней оценки
+            if lower_bound is not None and fitness[0] <= lower_bound:
+                break
+
+            children = []
+            while len(children) < population_size - elite_size:
+                mother = _tournament(population, fitness, rng)
+                father = _tournament(population, fitness, rng)
+                children.append(mutate(crossover(mother, father, rng), operations, mutation_rate, rng))
+
+            population = population[:elite_size] + children
+            fitness = fitness[:elite_size] + evaluate(children)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    start_times = decode(operations, capacities, population[0])
+
+    # Обновление всех времен
+    apply_start_times(operations, start_times)
+
+    total_duration = max(op['early_finish'] for op in operations.values())
+    return critical_path, total_duration, convergence
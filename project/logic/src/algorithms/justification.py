@@ -0,0 +1,106 @@
+import time
+
+from .profile import ResourceProfile
+from .utils import apply_start_times, resource_capacities, topological_order
+from .windows import deadline, release_time
+
+
+def _makespan(operations, start_times):
+    return max((start + operations[act]['duration'] for act, start in start_times.items()), default=0)
+
+
+def _fixed_profile(operations, capacities, start_times, fixed):
+    profile = ResourceProfile(capacities)
+    for act in fixed:
+        op = operations[act]
+        profile.add(start_times[act], start_times[act] + op['duration'], op['resources'])
+    return profile
+
+
+# Сдвиг вправо: работы в порядке убывания финиша ставятся как можно позже
+def right_justify(operations, capacities, start_times, fixed, horizon, rank) -> dict:
+    profile = _fixed_profile(operations, capacities, start_times, fixed)
+    new_starts = {act: start_times[act] for act in fixed}
+
+    order = sorted(
+        (act for act in start_times if act not in fixed),
+        key=lambda act: (start_times[act] + operations[act]['duration'], start_times[act], rank[act]),
+        reverse=True,
+    )
+    for act in order:
+        op = operations[act]
+        latest_finish = min((new_starts[succ] for succ in op['successors'] if succ in new_starts), default=horizon)
+        latest_finish = min(latest_finish, deadline(op) or latest_finish)
+        start_time = profile.latest_start(latest_finish - op['duration'], op['duration'], op['resources'])
+        if start_time is None:
+            start_time = start_times[act]
+
+        new_starts[act] = start_time
+        profile.add(start_time, start_time + op['duration'], op['resources'])
+
+    return new_starts
+
+
+# Сдвиг влево: работы в порядке возрастания старта ставятся как можно раньше
+def left_justify(operations, capacities, start_times, fixed, min_start, rank) -> dict:
+    profile = _fixed_profile(operations, capacities, start_times, fixed)
+    new_starts = {act: start_times[act] for act in fixed}
+
+    order = sorted(
+        (act for act in start_times if act not in fixed),
+        key=lambda act: (start_times[act], rank[act]),
+    )
+    for act in order:
+        op = operations[act]
+        earliest_start = max(
+            (new_starts[pre] + operations[pre]['duration'] for pre in op['predecessors'] if pre in new_starts),
+            default=0,
+        )
+        earliest_start = max(earliest_start, min_start, release_time(op))
+        start_time = profile.earliest_start(earliest_start, op['duration'], op['resources'])
+        if start_time is None:
+            start_time = start_times[act]
+
+        new_starts[act] = start_time
+        profile.add(start_time, start_time + op['duration'], op['resources'])
+
+    return new_starts
+
+
+# Двойное выравнивание (forward-backward improvement) готового расписания.
+# Работы из fixed не сдвигаются, остальные не начинаются раньше min_start.
+# Остановка при достижении нижней оценки lower_bound
+def justify(
+    operations, df_resources, fixed=(), min_start=0, time_limit=1.0, max_iterations=50, lower_bound=None
+) -> tuple[int, int]:
+    capacities = resource_capacities(df_resources)
+    fixed = set(fixed)
+    rank = {act: i for i, act in enumerate(topological_order(operations))}
+    for act in operations:
+        rank.setdefault(act, len(rank))
+
+    start_times = {act: op['early_start'] for act, op in operations.items()}
+    best_makespan = _makespan(operations, start_times)
+    stop_time = time.perf_counter() + time_limit
+
+    iterations = 0
+    while iterations < max_iterations and time.perf_counter() < stop_time:
+        if lower_bound is not None and best_makespan <= lower_bound:
+            break
+        iterations += 1
+        right = right_justify(operations, capacities, start_times, fixed, best_makespan, rank)
+        left = left_justify(operations, capacities, right, fixed, min_start, rank)
+
+        makespan = _makespan(operations, left)
+        if makespan > best_makespan:
+            break
+
+        start_times = left
+        if makespan == best_makespan:
+            break
+        best_makespan = makespan
+
+    # Обновление всех времен
+    apply_start_times(operations, start_times)
+    print(f"Justification finished after {iterations} iterations, makespan {best_makespan}.")
+    return best_makespan, iterations
@@ -0,0 +1,196 @@
+import time
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+
+from .profile import UsageTree, resource_demand
+from .utils import resource_capacities
+from .windows import deadline, release_time
+
+OBJECTIVES = ('peak', 'variance')
+
+
+# Статистика загрузки по ресурсам на [0, horizon): пик, средняя загрузка и дисперсия
+def profile_stats(operations, horizon) -> dict:
+    deltas = defaultdict(lambda: defaultdict(int))
+    for op in operations.values():
+        for r, q in resource_demand(op['resources']).items():
+            deltas[r][op['early_start']] += q
+            deltas[r][op['early_finish']] -= q
+
+    stats = {}
+    for r in sorted(deltas):
+        usage = peak = total = squares = 0
+        times = sorted(deltas[r])
+        for t, t_next in zip(times, times[1:]):
+            usage += deltas[r][t]
+            peak = max(peak, usage)
+            total += usage * (t_next - t)
+            squares += usage * usage * (t_next - t)
+        average = total / horizon if horizon else 0.0
+        stats[r] = {
+            'peak': peak,
+            'average': average,
+            'variance': squares / horizon - average * average if horizon else 0.0,
+        }
+    return stats
+
+
+def _place(trees, demand, start, finish, amount) -> None:
+    for r, q in demand.items():
+        trees[r].add(start, finish, q * amount)
+
+
+# Допустимые старты работы: после предшественников и release_time, финиш не позже
+# последователей, deadline и окончания проекта
+def _window(operations, op, horizon) -> tuple[int, int]:
+    earliest = max((operations[pre]['early_finish'] for pre in op['predecessors']), default=0)
+    earliest = max(earliest, release_time(op))
+    latest_finish = min((operations[succ]['early_start'] for succ in op['successors']), default=horizon)
+    latest_finish = min(latest_finish, deadline(op) or latest_finish)
+    return earliest, latest_finish - op['duration']
+
+
+# Оценка меняется только там, где начало или конец работы проходит точку излома
+# профиля ее ресурсов, поэтому кандидаты - концы окна и старты, при которых
+# работа начинается или заканчивается в точке излома
+def _candidates(op, demand, earliest, latest, breakpoints) -> list:
+    duration = op['duration']
+    candidates = {earliest, latest, op['early_start']}
+    for r in demand:
+        points = breakpoints[r]
+        for point in points[bisect_left(points, earliest):bisect_right(points, latest + duration)]:
+            for start in (point, point - duration):
+                if earliest <= start <= latest:
+                    candidates.add(start)
+    return sorted(candidates)
+
+
+# Точки излома профилей и деревья загрузки на сжатой оси итерации: в оси есть
+# начало и конец работы при каждом ее кандидате
+def _build_trees(operations, demands, horizon):
+    breakpoints = defaultdict(lambda: {0, horizon})
+    for act, op in operations.items():
+        for r in demands[act]:
+            breakpoints[r].update((op['early_start'], op['early_finish']))
+    breakpoints = {r: sorted(points) for r, points in breakpoints.items()}
+
+    candidates = {}
+    times = defaultdict(set)
+    for act, op in operations.items():
+        demand = demands[act]
+        for r in demand:
+            times[r].update((op['early_start'], op['early_finish']))
+        if not demand or op['duration'] <= 0:
+            continue
+        earliest, latest = _window(operations, op, horizon)
+        if latest <= earliest:
+            continue
+        candidates[act] = _candidates(op, demand, earliest, latest, breakpoints)
+        for r in demand:
+            times[r].update(candidates[act])
+            times[r].update(start + op['duration'] for start in candidates[act])
+
+    trees = {r: UsageTree(points) for r, points in times.items()}
+    for act, op in operations.items():
+        _place(trees, demands[act], op['early_start'], op['early_finish'], 1)
+    return trees, candidates
+
+
+# Оценка старта: (пик на отрезке работы по ее ресурсам, прирост суммы квадратов загрузки).
+# Для каждого ресурса один запрос к дереву - O(log числа точек оси).
+# None, если старт перегружает ресурс сильнее, чем текущее положение работы
+def _score(trees, demand, start, duration, limits):
+    peak = squares = 0
+    for r, q in demand.items():
+        range_max, range_sum = trees[r].query(start, start + duration)
+        if limits is not None and range_max + q > limits[r]:
+            return None
+        peak = max(peak, range_max + q)
+        squares += q * (2 * range_sum + q * duration)
+    return peak, squares
+
+
+# Выравнивание ресурсов готового расписания: некритические работы сдвигаются
+# в пределах своего резерва так, чтобы уменьшить пик загрузки (objective='peak')
+# или ее дисперсию (objective='variance'). Предшествование, временные окна
+# и длительность проекта сохраняются, мощности ресурсов (если заданы) не превышаются.
+# time_limit проверяется при переборе кандидатов каждой работы
+def level_resources(operations, df_resources=None, objective='peak', max_iterations=20, time_limit=1.0) -> dict:
+    if objective not in OBJECTIVES:
+        raise ValueError(f"Unknown leveling objective '{objective}'.")
+
+    horizon = max((op['early_finish'] for op in operations.values()), default=0)
+    capacities = resource_capacities(df_resources) if df_resources is not None else None
+    before = profile_stats(operations, horizon)
+    demands = {act: resource_demand(op['resources']) for act, op in operations.items()}
+
+    moves = 0
+    iterations = 0
+    timed_out = False
+    stop_time = time.perf_counter() + time_limit
+    while not timed_out and iterations < max_iterations and time.perf_counter() < stop_time:
+        iterations += 1
+        improved = False
+        trees, candidates = _build_trees(operations, demands, horizon)
+
+        # Сначала сдвигаются работы с поздним финишем: они освобождают место предшественникам
+        order = sorted(candidates, key=lambda act: operations[act]['early_finish'], reverse=True)
+        for act in order:
+            op = operations[act]
+            demand = demands[act]
+            duration = op['duration']
+            earliest, latest = _window(operations, op, horizon)
+            if latest <= earliest:
+                continue
+
+            current = op['early_start']
+            _place(trees, demand, current, current + duration, -1)
+
+            # Уже перегруженный ресурс не должен стать загруженнее, чем сейчас
+            limits = None
+            if capacities is not None:
+                limits = {}
+                for r, q in demand.items():
+                    range_max = trees[r].query(current, current + duration)[0]
+                    limits[r] = max(capacities.get(r, 0), range_max + q)
+
+            best_start = current
+            best_score = _score(trees, demand, current, duration, limits)
+            if objective == 'variance':
+                best_score = best_score[::-1]
+            for start in candidates[act]:
+                if time.perf_counter() > stop_time:
+                    timed_out = True
+                    break
+                if not earliest <= start <= latest:
+                    continue
+                score = _score(trees, demand, start, duration, limits)
+                if score is None:
+                    continue
+                if objective == 'variance':
+                    score = score[::-1]
+                if score < best_score:
+                    best_start, best_score = start, score
+
+            _place(trees, demand, best_start, best_start + duration, 1)
+            if best_start != current:
+                # Поздние сроки не меняются: работа остается в пределах своего резерва
+                op['early_start'] = best_start
+                op['early_finish'] = best_start + duration
+                moves += 1
+                improved = True
+            if timed_out:
+                break
+
+        if not improved:
+            break
+
+    after = profile_stats(operations, horizon)
+    print(f"Resource leveling ({objective}) finished after {iterations} iterations, {moves} moves.")
+    return {
+        'objective': objective,
+        'moves': moves,
+        'iterations': iterations,
+        'before': before,
+        'after': after,
+    }
@@ -0,0 +1,187 @@
+from bisect import bisect_left, bisect_right
+from collections import Counter
+
+# Начало оси времени: первый отрезок профиля всегда пустой
+MIN_TIME = float("-inf")
+
+
+def resource_demand(resources) -> Counter:
+    # Каждое упоминание ресурса у работы - одна единица
+    return Counter(resources)
+
+
+class ResourceProfile:
+    # Загрузка ресурсов на сжатой оси времени: хранятся только точки, где
+    # загрузка меняется. usage[r][i] действует на [times[r][i], times[r][i + 1]),
+    # последний отрезок тянется до бесконечности.
+
+    def __init__(self, capacities: dict):
+        self.capacities = dict(capacities)
+        self.times = {r: [MIN_TIME] for r in self.capacities}
+        self.usage = {r: [0] for r in self.capacities}
+
+    def _split(self, r, t) -> int:
+        times = self.times[r]
+        usage = self.usage[r]
+        i = bisect_right(times, t) - 1
+        if times[i] != t:
+            i += 1
+            times.insert(i, t)
+            usage.insert(i, usage[i - 1])
+        return i
+
+    def add(self, start, finish, resources, amount=1) -> None:
+        if finish <= start:
+            return
+        for r, q in resource_demand(resources).items():
+            i = self._split(r, start)
+            j = self._split(r, finish)
+            usage = self.usage[r]
+            for k in range(i, j):
+                usage[k] += q * amount
+
+    def remove(self, start, finish, resources) -> None:
+        self.add(start, finish, resources, amount=-1)
+
+    def segments(self, r):
+        times = self.times[r]
+        usage = self.usage[r]
+        for i in range(1, len(times)):
+            end = times[i + 1] if i + 1 < len(times) else None
+            yield times[i], end, usage[i]
+
+    def _first_conflict(self, r, start, finish, limit):
+        # Конец первого перегруженного отрезка внутри [start, finish)
+        times = self.times[r]
+        usage = self.usage[r]
+        i = bisect_right(times, start) - 1
+        while i < len(times) and times[i] < finish:
+            if usage[i] > limit:
+                return times[i + 1]
+            i += 1
+        return None
+
+    def _last_conflict(self, r, start, finish, limit):
+        # Начало последнего перегруженного отрезка внутри [start, finish)
+        times = self.times[r]
+        usage = self.usage[r]
+        i = bisect_left(times, finish) - 1
+        while i >= 0:
+            segment_end = times[i + 1] if i + 1 < len(times) else None
+            if segment_end is not None and segment_end <= start:
+                break
+            if usage[i] > limit:
+                return times[i]
+            i -= 1
+        return None
+
+    def fits(self, resources) -> bool:
+        return all(
+            q <= self.capacities[r] for r, q in resource_demand(resources).items()
+        )
+
+    def earliest_start(self, start, duration, resources):
+        demand = resource_demand(resources)
+        if not self.fits(demand):
+            return None
+        if duration <= 0:
+            return start
+
+        # Кандидаты на старт - только точки излома профиля
+        while True:
+            for r, q in demand.items():
+                conflict_end = self._first_conflict(
+                    r, start, start + duration, self.capacities[r] - q
+                )
+                if conflict_end is not None:
+                    start = conflict_end
+                    break
+            else:
+                return start
+
+    def latest_start(self, start, duration, resources):
+        demand = resource_demand(resources)
+        if not self.fits(demand):
+            return None
+        if duration <= 0:
+            return start
+
+        while True:
+            for r, q in demand.items():
+                conflict_start = self._last_conflict(
+                    r, start, start + duration, self.capacities[r] - q
+                )
+                if conflict_start is not None:
+                    start = conflict_start - duration
+                    break
+            else:
+                return start
+
+    def conflicts(self) -> dict:
+        conflicts = {r: [] for r in self.capacities}
+        for r in self.capacities:
+            for start, end, usage in self.segments(r):
+                if usage <= self.capacities[r]:
+                    continue
+                if conflicts[r] and conflicts[r][-1][1] == start:
+                    conflicts[r][-1] = (conflicts[r][-1][0], end)
+                else:
+                    conflicts[r].append((start, end))
+        return conflicts
+
+
+class UsageTree:
+    # Загрузка одного ресурса на сжатой оси: times - моменты, в которых работы
+    # могут начинаться и заканчиваться. Листья дерева отрезков - элементарные
+    # отрезки [times[i], times[i + 1]); прибавление на отрезке, максимум и сумма
+    # загрузки по времени на отрезке - за O(log len(times)), независимо от
+    # масштаба времени. Отложенное прибавление хранится в узле и не проталкивается вниз
+
+    def __init__(self, times):
+        self.times = sorted(set(times))
+        self.index = {t: i for i, t in enumerate(self.times)}
+        self.size = max(1, len(self.times) - 1)
+        self.max = [0] * (4 * self.size)
+        self.sum = [0] * (4 * self.size)
+        self.pending = [0] * (4 * self.size)
+
+    def _length(self, lo, hi):
+        if len(self.times) < 2:
+            return 0
+        return self.times[hi] - self.times[lo]
+
+    def _add(self, node, lo, hi, left, right, value):
+        if right <= lo or hi <= left:
+            return
+        if left <= lo and hi <= right:
+            self.max[node] += value
+            self.sum[node] += value * self._length(lo, hi)
+            self.pending[node] += value
+            return
+        mid = (lo + hi) // 2
+        self._add(2 * node, lo, mid, left, right, value)
+        self._add(2 * node + 1, mid, hi, left, right, value)
+        self.max[node] = max(self.max[2 * node], self.max[2 * node + 1]) + self.pending[node]
+        self.sum[node] = self.sum[2 * node] + self.sum[2 * node + 1] + self.pending[node] * self._length(lo, hi)
+
+    def _query(self, node, lo, hi, left, right):
+        if right <= lo or hi <= left:
+            return float('-inf'), 0
+        if left <= lo and hi <= right:
+            return self.max[node], self.sum[node]
+        mid = (lo + hi) // 2
+        left_max, left_sum = self._query(2 * node, lo, mid, left, right)
+        right_max, right_sum = self._query(2 * node + 1, mid, hi, left, right)
+        overlap = self._length(max(lo, left), min(hi, right))
+        return max(left_max, right_max) + self.pending[node], left_sum + right_sum + self.pending[node] * overlap
+
+    # Концы отрезков должны быть среди times
+    def add(self, start, finish, value) -> None:
+        if start < finish:
+            self._add(1, 0, self.size, self.index[start], self.index[finish], value)
+
+    # Максимум и сумма загрузки по времени на [start, finish)
+    def query(self, start, finish) -> tuple:
+        if start >= finish:
+            return 0, 0
+        return self._query(1, 0, self.size, self.index[start], self.index[finish])
@@ -1,11 +1,13 @@
 from .cpm import cpm
-from .utils import generate_sequence_by_est
+from .utils import generate_sequence_by_est, apply_start_times, resource_capacities
+from .windows import release_time
 
 def check_resources(sequence, operations, resources):
     schedule_start_times = {}
 
     for act in sequence:
         start_time = max([schedule_start_times.get(pre, 0) + operations[pre]['duration'] for pre in operations[act]['predecessors']], default=0)
+        start_time = max(start_time, release_time(operations[act]))
         
         while True:
             resource_usage = {r: 0 for r in resources.keys()}
@@ -37,19 +39,14 @@ def check_resources(sequence, operations, resources):
 
     return schedule_start_times
 
-def rcpm(operations, df_resources):
-    critical_path, _ = cpm(operations)
-    resources = {res['type']: res['quantity'] for _, res in df_resources.iterrows()}
+def rcpm(operations, df_resources, horizon=None):
+    critical_path, _ = cpm(operations, horizon=horizon)
+    resources = resource_capacities(df_resources)
     sequence_by_est = generate_sequence_by_est(operations)
     schedule_start_times = check_resources(sequence_by_est, operations, resources)
 
     # Обновление всех времен
-    for act, start_time in schedule_start_times.items():
-        delta = start_time - operations[act]['early_start']
-        operations[act]['early_start'] += delta
-        operations[act]['early_finish'] += delta
-        operations[act]['late_start'] += delta
-        operations[act]['late_finish'] += delta
+    apply_start_times(operations, schedule_start_times)
 
     total_duration = max(op['early_finish'] for op in operations.values())
     return critical_path, total_duration
@@ -0,0 +1,31 @@
+from .utils import topological_order
+
+
+# Транзитивное сокращение сети: удаляется связь A -> C, если есть путь A -> B -> C.
+# Достижимость хранится битовыми множествами (int) по топологическому порядку
+def transitive_reduction(operations) -> int:
+    order = topological_order(operations)
+    position = {act: i for i, act in enumerate(order)}
+    reachable = {}
+    removed = 0
+
+    for act in reversed(order):
+        op = operations[act]
+        covered = 0
+        redundant = []
+        # Прямые последователи по возрастанию позиции: если последователь
+        # достижим через ранее просмотренного, связь избыточна
+        for succ in sorted(op['successors'], key=position.__getitem__):
+            bit = 1 << position[succ]
+            if covered & bit:
+                redundant.append(succ)
+            else:
+                covered |= bit | reachable[succ]
+        reachable[act] = covered
+
+        for succ in redundant:
+            op['successors'].discard(succ)
+            operations[succ]['predecessors'].discard(act)
+        removed += len(redundant)
+
+    return removed
@@ -0,0 +1,89 @@
+from math import inf
+
+from .cpm import cpm
+from .justification import justify as justify_schedule
+from .profile import ResourceProfile
+from .ssgs import priority_activity_list, serial_sgs
+from .utils import apply_start_times, optional_value, resource_capacities
+
+
+def _fact_time(value):
+    value = optional_value(value)
+    return None if value is None else int(value)
+
+
+# Фактические старты/финиши выполненных и начатых работ из current_status
+def read_progress(operations, df_current_status) -> tuple[dict, dict, int]:
+    done = {}
+    in_progress = {}
+    status_date = 0
+
+    for _, row in df_current_status.iterrows():
+        act = row['op_id']
+        fact_start = _fact_time(row['fact_start'])
+        fact_finish = _fact_time(row['fact_finish'])
+        if act not in operations or fact_start is None:
+            continue
+
+        # NULL в is_done - прогресс не отмечен, работа не завершена
+        if bool(optional_value(row['is_done'])) and fact_finish is not None:
+            done[act] = (fact_start, fact_finish)
+            status_date = max(status_date, fact_finish)
+        else:
+            in_progress[act] = fact_start
+            status_date = max(status_date, fact_start)
+
+    return done, in_progress, status_date
+
+
+# Перепланирование невыполненных работ: выполненные и начатые работы
+# замораживаются по факту, остальные планируются SSGS не раньше даты статуса.
+# Порядок берется из предыдущего расписания (results), если оно есть
+def reschedule(
+    operations, df_resources, df_current_status, df_results=None, use_pr=True, justify=False, time_limit=1.0
+):
+    done, in_progress, status_date = read_progress(operations, df_current_status)
+
+    # Фактическая длительность выполненных работ
+    for act, (fact_start, fact_finish) in done.items():
+        operations[act]['duration'] = fact_finish - fact_start
+
+    critical_path, _ = cpm(operations)
+    profile = ResourceProfile(resource_capacities(df_resources))
+
+    start_times = {act: fact_start for act, (fact_start, _) in done.items()}
+    start_times.update(in_progress)
+    for act, start_time in start_times.items():
+        op = operations[act]
+        profile.add(start_time, start_time + op['duration'], op['resources'])
+
+    priority = None
+    if df_results is not None and not df_results.empty:
+        previous_starts = {row['op_id']: row['early_start'] for _, row in df_results.iterrows()}
+        fallback = 'late_finish' if use_pr else 'early_start'
+        priority = {
+            act: (previous_starts.get(act, inf), op[fallback])
+            for act, op in operations.items()
+        }
+
+    activity_list = priority_activity_list(
+        operations, use_pr=use_pr, priority=priority, scheduled=start_times
+    )
+    if len(activity_list) + len(start_times) < len(operations):
+        print('!!! The schedule cannot be done !!!')
+
+    start_times = serial_sgs(operations, activity_list, profile, start_times, min_start=status_date)
+
+    # Обновление всех времен
+    apply_start_times(operations, start_times)
+
+    if justify:
+        fixed = set(done) | set(in_progress)
+        justify_schedule(operations, df_resources, fixed=fixed, min_start=status_date, time_limit=time_limit)
+
+    print(
+        f"Rescheduled {len(activity_list)} operations from time {status_date}, "
+        f"{len(done)} done and {len(in_progress)} in progress are frozen."
+    )
+    total_duration = max(op['early_finish'] for op in operations.values())
+    return critical_path, total_duration
@@ -0,0 +1,91 @@
+from concurrent.futures import ProcessPoolExecutor
+
+from .components import SCHEDULERS
+from .cpm import cpm
+from .utils import resource_capacities, topological_order
+from .validation import InvalidProjectError
+
+# Базовая сеть в процессах пула: передается один раз при старте процесса
+_base_operations = None
+_base_capacities = None
+
+
+def _init_worker(operations, capacities) -> None:
+    global _base_operations, _base_capacities
+    _base_operations = operations
+    _base_capacities = capacities
+
+
+def validate_overlay(operations, capacities, overlay) -> None:
+    errors = []
+    name = overlay.get('name')
+    for act in overlay.get('durations', {}):
+        if act not in operations:
+            errors.append(f"Scenario '{name}' changes unknown operation '{act}'")
+    for r in overlay.get('capacities', {}):
+        if r not in capacities:
+            errors.append(f"Scenario '{name}' changes unknown resource '{r}'")
+    for pre, succ in overlay.get('added_links', []):
+        if pre not in operations or succ not in operations:
+            errors.append(f"Scenario '{name}' adds a link with unknown operation '{pre}' -> '{succ}'")
+    if errors:
+        raise InvalidProjectError(errors)
+
+
+# Сценарий поверх базовой сети. Работы копируются поверхностно, множества
+# связей копируются только у работ, к которым добавлены связи
+def apply_overlay(operations, capacities, overlay) -> tuple[dict, dict]:
+    scenario = {act: dict(op) for act, op in operations.items()}
+
+    for act, duration in overlay.get('durations', {}).items():
+        scenario[act]['duration'] = duration
+
+    for pre, succ in overlay.get('added_links', []):
+        if scenario[pre]['successors'] is operations[pre]['successors']:
+            scenario[pre]['successors'] = set(operations[pre]['successors'])
+        if scenario[succ]['predecessors'] is operations[succ]['predecessors']:
+            scenario[succ]['predecessors'] = set(operations[succ]['predecessors'])
+        scenario[pre]['successors'].add(succ)
+        scenario[succ]['predecessors'].add(pre)
+
+    if overlay.get('added_links') and len(topological_order(scenario)) < len(scenario):
+        raise InvalidProjectError([f"Scenario '{overlay.get('name')}' creates a precedence cycle"])
+
+    return scenario, {**capacities, **overlay.get('capacities', {})}
+
+
+def evaluate_overlay(operations, capacities, overlay, algorithm) -> dict:
+    scenario, scenario_capacities = apply_overlay(operations, capacities, overlay)
+    if algorithm == 'cpm':
+        critical_path, total_duration = cpm(scenario)
+    else:
+        critical_path, total_duration = SCHEDULERS[algorithm](scenario, scenario_capacities)
+    return {
+        'name': overlay.get('name'),
+        'duration': int(total_duration),
+        'critical_path': critical_path,
+    }
+
+
+def _evaluate(overlay, algorithm):
+    return evaluate_overlay(_base_operations, _base_capacities, overlay, algorithm)
+
+
+# Пакетная оценка сценариев "что если" без записи в results
+def evaluate_scenarios(operations, df_resources, overlays, algorithm='ssgs', workers=None) -> list[dict]:
+    capacities = resource_capacities(df_resources)
+    for overlay in overlays:
+        validate_overlay(operations, capacities, overlay)
+
+    base = evaluate_overlay(operations, capacities, {'name': 'base'}, algorithm)
+
+    if workers == 1 or len(overlays) <= 1:
+        rows = [evaluate_overlay(operations, capacities, overlay, algorithm) for overlay in overlays]
+    else:
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(operations, capacities)) as executor:
+            rows = list(executor.map(_evaluate, overlays, [algorithm] * len(overlays)))
+
+    for row in [base, *rows]:
+        row['delta'] = row['duration'] - base['duration']
+        row['delta_percent'] = 100 * row['delta'] / base['duration'] if base['duration'] else 0.0
+    return [base, *rows]
@@ -0,0 +1,71 @@
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from math import prod
+
+from .cpm import cpm
+from .profile import ResourceProfile
+from .ssgs import priority_activity_list, serial_sgs
+from .utils import resource_capacities
+from .validation import InvalidProjectError
+
+# Предел числа точек сетки: каждая точка - полный прогон SGS
+MAX_GRID_POINTS = 1000
+
+# Сеть и список приоритетов в процессах пула: передаются один раз
+_operations = None
+_activity_list = None
+_capacities = None
+
+
+def _init_worker(operations, activity_list, capacities) -> None:
+    global _operations, _activity_list, _capacities
+    _operations = operations
+    _activity_list = activity_list
+    _capacities = capacities
+
+
+def evaluate_capacities(operations, activity_list, capacities) -> int | None:
+    start_times = serial_sgs(operations, activity_list, ResourceProfile(capacities))
+    if len(start_times) < len(activity_list):
+        return None
+    return int(max((start + operations[act]['duration'] for act, start in start_times.items()), default=0))
+
+
+def _evaluate(point):
+    return evaluate_capacities(_operations, _activity_list, {**_capacities, **point})
+
+
+# Кривая "мощность ресурсов - длительность проекта" по сетке мощностей.
+# CPM и список приоритетов (min LFT) считаются один раз для всех точек
+def capacity_sweep(operations, df_resources, grid, use_pr=True, workers=None) -> list[dict]:
+    capacities = resource_capacities(df_resources)
+    unknown = set(grid) - set(capacities)
+    if unknown:
+        raise InvalidProjectError([f"Unknown resource '{r}' in the capacity grid" for r in sorted(unknown)])
+
+    errors = [
+        f"Negative capacity {value} for resource '{r}' in the capacity grid"
+        for r, values in grid.items() for value in values if value < 0
+    ]
+    size = prod(len(values) for values in grid.values())
+    if size > MAX_GRID_POINTS:
+        errors.append(f"The capacity grid has {size} points, at most {MAX_GRID_POINTS} are allowed")
+    if errors:
+        raise InvalidProjectError(errors)
+
+    cpm(operations)
+    activity_list = priority_activity_list(operations, use_pr=use_pr)
+
+    names = list(grid)
+    points = [dict(zip(names, values)) for values in product(*(grid[r] for r in names))]
+
+    if workers == 1 or len(points) <= 1:
+        _init_worker(operations, activity_list, capacities)
+        durations = [_evaluate(point) for point in points]
+    else:
+        with ProcessPoolExecutor(
+            workers, initializer=_init_worker, initargs=(operations, activity_list, capacities)
+        ) as executor:
+            durations = list(executor.map(_evaluate, points))
+
+    return [{'capacities': point, 'duration': duration} for point, duration in zip(points, durations)]
@@ -1,123 +1,169 @@
-from .cpm import cpm
+import heapq
 
-def ssgs(operations, df_resources, use_pr=False):
-    critical_path, _ = cpm(operations)
-    resources = {res['type']: res['quantity'] for _, res in df_resources.iterrows()}
+from .cpm import cpm
+from .profile import ResourceProfile
+from .utils import apply_start_times, resource_capacities
+from .windows import deadline, release_time
+
+
+# Список работ, допустимый по предшествованию. Из готовых к планированию
+# выбирается работа с min LFT (use_pr), с min значением priority (если задан)
+# либо первая по порядку в operations. Работы из scheduled уже спланированы
+def priority_activity_list(operations, use_pr=False, priority=None, scheduled=()) -> list:
+    scheduled = set(scheduled)
+    index = {act: i for i, act in enumerate(operations)}
+    remaining = {
+        act: sum(pre not in scheduled for pre in op['predecessors'])
+        for act, op in operations.items()
+        if act not in scheduled
+    }
+
+    def key(act):
+        if priority is not None:
+            return (priority[act], index[act], act)
+        return (operations[act]['late_finish'] if use_pr else 0, index[act], act)
+
+    eligible = [key(act) for act, count in remaining.items() if count == 0]
+    heapq.heapify(eligible)
+
+    activity_list = []
+    while eligible:
+        act = heapq.heappop(eligible)[2]
+        activity_list.append(act)
+        for succ in operations[act]['successors']:
+            if succ not in remaining:
+                continue
+            remaining[succ] -= 1
+            if remaining[succ] == 0:
+                heapq.heappush(eligible, key(succ))
+
+    return activity_list
+
+
+# Последовательная схема генерации расписания (SSGS) по списку работ
+def serial_sgs(operations, activity_list, profile, start_times=None, min_start=0) -> dict:
+    start_times = {} if start_times is None else start_times
+    finish_times = {act: start + operations[act]['duration'] for act, start in start_times.items()}
+
+    for act in activity_list:
+        op = operations[act]
+        earliest_start = max((finish_times.get(pre, 0) for pre in op['predecessors']), default=0)
+        earliest_start = max(earliest_start, min_start, release_time(op))
+        start_time = profile.earliest_start(earliest_start, op['duration'], op['resources'])
+
+        if start_time is None:
+            print(f"Operation {act} cannot added in the schedule.")
+            continue
+
+        start_times[act] = start_time
+        finish_times[act] = start_time + op['duration']
+        profile.add(start_time, finish_times[act], op['resources'])
+
+    return start_times
+
+
+def ssgs(operations, df_resources, use_pr=False, horizon=None):
+    critical_path, _ = cpm(operations, horizon=horizon)
+    profile = ResourceProfile(resource_capacities(df_resources))
+
+    # С директивными сроками работы выбираются по min LFT: поздние финиши
+    # после обратного прохода CPM уже сжаты сроками
+    use_pr = use_pr or any(deadline(op) for op in operations.values())
+    activity_list = priority_activity_list(operations, use_pr=use_pr)
+    if len(activity_list) < len(operations):
+        print('!!! The schedule cannot be done !!!')
+
+    start_times = serial_sgs(operations, activity_list, profile)
 
-    start_times = {}
-    finish_times = {}
-    scheduled = []
-    max_time = sum(op['duration'] for op in operations.values())
-    resource_availability = {r: [resources[r]] * max_time for r in resources.keys()}
-
-    while len(scheduled) < len(operations):
-        eligible_activities = [act for act in operations if act not in scheduled and all(pre in scheduled for pre in operations[act]['predecessors'])]
-
-        if not eligible_activities:
-            print('!!! The schedule cannot be done !!!')
-            break
-
-        # min-lft приоритет
-        if use_pr:
-            pr = {act: operations[act]['late_finish'] for act in eligible_activities}
-            current_act = min(pr, key=pr.get)
-        else:
-            current_act = eligible_activities[0]
-
-        earliest_start = max(finish_times.get(pre, 0) for pre in operations[current_act]['predecessors']) if operations[current_act]['predecessors'] else 0
-        duration = operations[current_act]['duration']
-
-        eligible_times = []
-        for t in range(earliest_start, max_time):
-            if all(resource_availability[r][t:t + duration].count(resources[r]) >= duration for r in operations[current_act]['resources']):
-                eligible_times.append(t)
-
-        if eligible_times:
-            start_time = min(eligible_times)
-            finish_time = start_time + duration
-            start_times[current_act] = start_time
-            finish_times[current_act] = finish_time
-            scheduled.append(current_act)
-
-            for r in operations[current_act]['resources']:
-                for time_slot in range(start_time, finish_time):
-                    resource_availability[r][time_slot] -= 1
-        else:
-            print(f"Operation {current_act} cannot added in the schedule.")
-            
     # Обновление всех времен
-    for act, start_time in start_times.items():
-        delta = start_time - operations[act]['early_start']
-        operations[act]['early_start'] += delta
-        operations[act]['early_finish'] += delta
-        operations[act]['late_start'] += delta
-        operations[act]['late_finish'] += delta
+    apply_start_times(operations, start_times)
 
     total_duration = max(op['early_finish'] for op in operations.values())
     return critical_path, total_duration
 
 
-def local_ssgs(operations, df_resources, selected_tasks, use_pr=True):
+# Работы, выбранные по списку и/или по окну времени [window_start, window_end).
+# Если заданы оба условия, берутся работы из списка, начинающиеся в окне
+def select_tasks(operations, selected_tasks=(), window=None) -> list:
+    if window is None:
+        return list(selected_tasks)
+    window_start, window_end = window
+    candidates = selected_tasks or operations
+    return [
+        act for act in candidates
+        if act in operations and window_start <= operations[act]['early_start'] < window_end
+    ]
+
+
+# Затронутая область: выбранные работы и все их потомки
+def downstream_region(operations, selected) -> set:
+    region = set(selected)
+    stack = list(selected)
+    while stack:
+        for succ in operations[stack.pop()]['successors']:
+            if succ not in region:
+                region.add(succ)
+                stack.append(succ)
+    return region
+
+
+# Локальный ремонт расписания: выбранные работы перепланируются с учетом
+# всех предшественников (в том числе невыбранных) на профиле загрузки
+# невыбранных работ, сдвиги распространяются на последующие работы.
+# Работы вне затронутой области не меняются
+def local_ssgs(operations, df_resources, selected_tasks, use_pr=True, window=None):
+    selected = set(select_tasks(operations, selected_tasks, window))
+    region = downstream_region(operations, selected)
+
+    profile = ResourceProfile(resource_capacities(df_resources))
+    for act, op in operations.items():
+        if act not in selected:
+            profile.add(op['early_start'], op['early_finish'], op['resources'])
 
-    resources = {res['type']: res['quantity'] for _, res in df_resources.iterrows()}
-    max_time = sum(op['duration'] for op in operations.values())
-    resource_availability = {r: [resources[r]] * max_time for r in resources.keys()}   
+    index = {act: i for i, act in enumerate(operations)}
+    remaining = {act: sum(pre in region for pre in operations[act]['predecessors']) for act in region}
 
-    for act, op in operations.items():
-        if act not in selected_tasks:
-            for r in op['resources']:
-                for time_slot in range(op['early_start'], op['early_finish']):
-                    resource_availability[r][time_slot] -= 1
+    # min-lft приоритет
+    def key(act):
+        return (operations[act]['late_finish'] if use_pr else 0, index[act], act)
+
+    eligible = [key(act) for act, count in remaining.items() if count == 0]
+    heapq.heapify(eligible)
 
     start_times = {}
-    finish_times = {}
-    scheduled = []
-    
-    selected_operations = {task: operations[task] for task in selected_tasks}
-
-    while len(scheduled) < len(selected_operations):
-        eligible_activities = [act for act in selected_operations if act not in scheduled]
-
-        if not eligible_activities:
-            print('!!!The schedule cannot be updated!!!')
-            break
-
-        # min-lft приоритет
-        if use_pr:
-            pr = {act: selected_operations[act]['late_finish'] for act in eligible_activities}
-            current_act = min(pr, key=pr.get)
-        else:
-            current_act = eligible_activities[0]
-
-        earliest_start = max(finish_times.get(pre, 0) for pre in selected_operations[current_act]['predecessors']) if selected_operations[current_act]['predecessors'] else 0
-        duration = selected_operations[current_act]['duration']
-
-        eligible_times = []
-        for t in range(earliest_start, max_time):
-            if all(resource_availability[r][t:t + duration].count(resources[r]) >= duration for r in selected_operations[current_act]['resources']):
-                eligible_times.append(t)
-
-        if eligible_times:
-            start_time = min(eligible_times)
-            finish_time = start_time + duration
+
+    def finish_time(act):
+        if act in start_times:
+            return start_times[act] + operations[act]['duration']
+        return operations[act]['early_finish']
+
+    while eligible:
+        current_act = heapq.heappop(eligible)[2]
+        op = operations[current_act]
+        earliest_start = max((finish_time(pre) for pre in op['predecessors']), default=0)
+        earliest_start = max(earliest_start, release_time(op))
+
+        if current_act in selected or op['early_start'] < earliest_start:
+            if current_act not in selected:
+                profile.remove(op['early_start'], op['early_finish'], op['resources'])
+
+            start_time = profile.earliest_start(earliest_start, op['duration'], op['resources'])
+            if start_time is None:
+                print(f"Operation {current_act} cannot added in the schedule.")
+                start_time = op['early_start']
+
             start_times[current_act] = start_time
-            finish_times[current_act] = finish_time
-            scheduled.append(current_act)
+            profile.add(start_time, start_time + op['duration'], op['resources'])
+
+        for succ in op['successors']:
+            remaining[succ] -= 1
+            if remaining[succ] == 0:
+                heapq.heappush(eligible, key(succ))
 
-            for r in selected_operations[current_act]['resources']:
-                for time_slot in range(start_time, finish_time):
-                    resource_availability[r][time_slot] -= 1
-        else:
-            print(f"Operation {current_act} cannot added in the schedule.")
+    print(f"Local repair touched {len(region)} operations, {len(start_times)} were placed.")
 
-            
     # Обновление всех времен
-    for act, start_time in start_times.items():
-        delta = start_time - operations[act]['early_start']
-        operations[act]['early_start'] += delta
-        operations[act]['early_finish'] += delta
-        operations[act]['late_start'] += delta
-        operations[act]['late_finish'] += delta
+    apply_start_times(operations, start_times)
 
     total_duration = max(op['early_finish'] for op in operations.values())
     return total_duration
@@ -1,5 +1,16 @@
 import ast
-import numpy as np
+from collections import deque
+from math import isnan
+
+from .profile import ResourceProfile
+
+
+# NULL из БД приходит как None или NaN
+def optional_value(value):
+    if value is None or (isinstance(value, float) and isnan(value)):
+        return None
+    return value
+
 
 # Словарь для алгоритмов планирования
 def prepare_operations(df) -> dict:
@@ -8,17 +19,53 @@ def prepare_operations(df) -> dict:
     for _, row in df.iterrows():
         operations[row['op_id']] = {
             'duration': row['duration'],
-            'predecessors': ast.literal_eval(row['predecessors']),
-            'successors': ast.literal_eval(row['successors']),
+            'predecessors': set(ast.literal_eval(row['predecessors'])),
+            'successors': set(ast.literal_eval(row['successors'])),
             'early_start': 0,
             'early_finish': 0,
             'late_start': 0,
             'late_finish': 0,
             'resources': ast.literal_eval(row['resources']),
-            'is_critical': False
+            'is_critical': False,
+            'optimistic_duration': optional_value(row.get('optimistic_duration')),
+            'pessimistic_duration': optional_value(row.get('pessimistic_duration')),
+            'distribution': optional_value(row.get('distribution')),
+            'release_time': optional_value(row.get('release_time')),
+            'deadline': optional_value(row.get('deadline')),
         }
     return operations
 
+
+# Копия сети для повторного планирования: алгоритмы меняют сроки работ
+# и множества связей, но не исходные данные
+def copy_operations(operations) -> dict:
+    return {
+        act: {
+            **op,
+            'predecessors': set(op['predecessors']),
+            'successors': set(op['successors']),
+            'resources': list(op['resources']),
+        }
+        for act, op in operations.items()
+    }
+
+
+# Топологический порядок (алгоритм Кана); работы на цикле в него не попадают
+def topological_order(operations) -> list:
+    in_degree = {act: len(op['predecessors']) for act, op in operations.items()}
+    queue = deque(act for act, degree in in_degree.items() if degree == 0)
+    order = []
+
+    while queue:
+        act = queue.popleft()
+        order.append(act)
+        for succ in operations[act]['successors']:
+            in_degree[succ] -= 1
+            if in_degree[succ] == 0:
+                queue.append(succ)
+
+    return order
+
 # Последовательность по EST
 def generate_sequence_by_est(operations) -> list:
     est_copy = {op_id: op['early_start'] for op_id, op in operations.items()}
@@ -34,33 +81,44 @@ def generate_sequence_by_est(operations) -> list:
     return sequence_by_est
 
 
+# Мощности ресурсов из таблицы resources (или уже готового словаря)
+def resource_capacities(df_resources) -> dict:
+    if isinstance(df_resources, dict):
+        return dict(df_resources)
+    return {row['type']: row['quantity'] for _, row in df_resources.iterrows()}
+
+
+# Сдвиг всех времен работ к новым стартам
+def apply_start_times(operations, start_times) -> None:
+    for act, start_time in start_times.items():
+        delta = start_time - operations[act]['early_start']
+        operations[act]['early_start'] += delta
+        operations[act]['early_finish'] += delta
+        operations[act]['late_start'] += delta
+        operations[act]['late_finish'] += delta
+
+
 def check_resource_conflicts(operations, df_resources) -> None:
-    resources = {row['type']: row['quantity'] for _, row in df_resources.iterrows()}
+    profile = ResourceProfile(resource_capacities(df_resources))
 
-    total_time = max(op['early_finish'] for op in operations.values())
-    resource_usage = {r: np.zeros(total_time + 1) for r in resources.keys()}
-    
     for act, op in operations.items():
-        start = op['early_start']
-        end = op['early_finish']
+        known_resources = []
         for r in op['resources']:
-            if r in resource_usage:
-                resource_usage[r][start:end] += 1
+            if r in profile.capacities:
+                known_resources.append(r)
             else:
                 print(f"!!!Resource {r} not found!!!")
+        profile.add(op['early_start'], op['early_finish'], known_resources)
 
-    conflicts = {r: [] for r in resources.keys()}
-    for r, usage in resource_usage.items():
-        for t in range(len(usage)):
-            if usage[t] > resources[r]:
-                conflicts[r].append(t)
-    
-    if all(not times for times in conflicts.values()):
+    # Конфликты - интервалы времени, а не отдельные единицы времени
+    conflicts = profile.conflicts()
+
+    if all(not intervals for intervals in conflicts.values()):
         print("No resource conflicts.")
     else:
-        for r, times in conflicts.items():
-            if times:
-                print(f"!!!Conflict with resource '{r}' in time: {times}")
+        for r, intervals in conflicts.items():
+            if intervals:
+                print(f"!!!Conflict with resource '{r}' in time: {intervals}")
 
 
 def check_precedence_relations(operations) -> None:
@@ -0,0 +1,110 @@
+import ast
+from collections import Counter, deque
+
+from .utils import optional_value
+
+
+class InvalidProjectError(Exception):
+    def __init__(self, errors):
+        self.errors = errors
+        super().__init__("; ".join(errors))
+
+
+def _parse(value, column, op_id, errors):
+    try:
+        parsed = ast.literal_eval(value) if isinstance(value, str) else value
+        return set(parsed) if column != 'resources' else list(parsed)
+    except (ValueError, SyntaxError, TypeError):
+        errors.append(f"Operation '{op_id}' has unparsable {column}: {value!r}")
+        return set() if column != 'resources' else []
+
+
+# Поиск одного цикла среди работ, не вошедших в топологический порядок.
+# У каждой такой работы есть предшественник из того же множества
+def _find_cycle(predecessors, remaining) -> list:
+    act = next(iter(remaining))
+    seen = {}
+    path = []
+    while act not in seen:
+        seen[act] = len(path)
+        path.append(act)
+        act = next(pre for pre in predecessors[act] if pre in remaining)
+    cycle = path[seen[act]:]
+    return list(reversed(cycle)) + [cycle[-1]]
+
+
+# Проверка сети работ за O(V + E): дубликаты, висячие и несимметричные связи,
+# неизвестные ресурсы и циклы
+def validate_operations(df_operations, resource_types=None) -> None:
+    errors = []
+
+    op_ids = list(df_operations['op_id'])
+    for op_id, count in Counter(op_ids).items():
+        if count > 1:
+            errors.append(f"Operation id '{op_id}' is duplicated {count} times")
+
+    predecessors = {}
+    successors = {}
+    for _, row in df_operations.iterrows():
+        op_id = row['op_id']
+        predecessors[op_id] = _parse(row['predecessors'], 'predecessors', op_id, errors)
+        successors[op_id] = _parse(row['successors'], 'successors', op_id, errors)
+        resources = _parse(row['resources'], 'resources', op_id, errors)
+
+        if resource_types is not None:
+            for r in sorted(set(resources) - set(resource_types)):
+                errors.append(f"Operation '{op_id}' uses unknown resource '{r}'")
+
+    for op_id in predecessors:
+        for pre in predecessors[op_id]:
+            if pre not in predecessors:
+                errors.append(f"Operation '{op_id}' has unknown predecessor '{pre}'")
+            elif op_id not in successors[pre]:
+                errors.append(f"Link '{pre}' -> '{op_id}' is missing in successors of '{pre}'")
+        for succ in successors[op_id]:
+            if succ not in successors:
+                errors.append(f"Operation '{op_id}' has unknown successor '{succ}'")
+            elif op_id not in predecessors[succ]:
+                errors.append(f"Link '{op_id}' -> '{succ}' is missing in predecessors of '{succ}'")
+
+    # Алгоритм Кана по предшественникам; оставшиеся работы лежат на циклах
+    in_degree = {op_id: sum(pre in predecessors for pre in preds) for op_id, preds in predecessors.items()}
+    followers = {op_id: [] for op_id in predecessors}
+    for op_id, preds in predecessors.items():
+        for pre in preds:
+            if pre in followers:
+                followers[pre].append(op_id)
+
+    queue = deque(op_id for op_id, degree in in_degree.items() if degree == 0)
+    visited = 0
+    while queue:
+        op_id = queue.popleft()
+        visited += 1
+        for follower in followers[op_id]:
+            in_degree[follower] -= 1
+            if in_degree[follower] == 0:
+                queue.append(follower)
+
+    if visited < len(predecessors):
+        remaining = {op_id for op_id, degree in in_degree.items() if degree > 0}
+        cycle = _find_cycle(predecessors, remaining)
+        errors.append(f"Precedence cycle detected: {' -> '.join(map(str, cycle))}")
+
+    if errors:
+        raise InvalidProjectError(errors)
+
+
+def validate_resources(df_resources) -> None:
+    errors = []
+
+    for r, count in Counter(df_resources['type']).items():
+        if count > 1:
+            errors.append(f"Resource type '{r}' is duplicated {count} times")
+
+    for _, row in df_resources.iterrows():
+        # NULL из read_sql приходит как NaN
+        if optional_value(row['quantity']) is None or row['quantity'] < 0:
+            errors.append(f"Resource '{row['type']}' has invalid quantity {row['quantity']!r}")
+
+    if errors:
+        raise InvalidProjectError(errors)
@@ -0,0 +1,47 @@
+from .validation import InvalidProjectError
+
+
+class InfeasibleDeadlineError(InvalidProjectError):
+    pass
+
+
+# Временные окна работ. 0 и NULL означают, что ограничение не задано
+# (так заполнены release_time и deadline во входных данных без окон)
+def release_time(op) -> int:
+    return op.get('release_time') or 0
+
+
+def deadline(op) -> int | None:
+    return op.get('deadline') or None
+
+
+# Работы, которые после прямого и обратного проходов CPM не укладываются
+# в свои окна: ранний старт позже позднего
+def window_errors(operations) -> list[str]:
+    errors = []
+    for act, op in operations.items():
+        if op['early_start'] > op['late_start']:
+            errors.append(
+                f"Operation '{act}' cannot meet the deadlines: it finishes at {op['early_finish']} at the earliest, "
+                f"but must finish by {op['late_finish']}"
+            )
+    return errors
+
+
+# Проверка готового расписания: старт не раньше release_time, финиш не позже deadline
+def check_time_windows(operations) -> None:
+    violations = []
+    for act, op in operations.items():
+        if op['early_start'] < release_time(op):
+            violations.append(
+                f"Operation '{act}' starts at {op['early_start']} before its release time {release_time(op)}"
+            )
+        if deadline(op) is not None and op['early_finish'] > deadline(op):
+            violations.append(f"Operation '{act}' finishes at {op['early_finish']} after its deadline {deadline(op)}")
+
+    if violations:
+        print("!!!Time window violations:")
+        for violation in violations:
+            print(violation)
+    else:
+        print("No time window violations.")
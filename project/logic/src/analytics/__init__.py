@@ -1 +1,4 @@
 from .current_status import *
+from .queries import *
+from .risk import *
+from .usage import *
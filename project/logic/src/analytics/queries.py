@@ -0,0 +1,34 @@
+import json
+
+
+# Аналитика на стороне БД: по сети передается только ответ
+def completion_percentage_query(cur) -> float:
+    cur.execute("SELECT COUNT(*) FILTER (WHERE is_done), COUNT(*) FROM current_status")
+    completed_tasks, total_tasks = cur.fetchone()
+    # процент работ завершенных
+    completion_percentage = (
+        (completed_tasks / total_tasks) * 100 if total_tasks else 0.0
+    )
+    print(f"Percentage of completed works: {completion_percentage}%")
+    return completion_percentage
+
+
+def project_delays_query(cur) -> str:
+    cur.execute(
+        """SELECT r.op_id, r.early_start, s.fact_start, r.early_finish, s.fact_finish
+           FROM results r
+           JOIN current_status s ON s.op_id = r.op_id
+           WHERE s.is_done
+             AND (r.early_start IS DISTINCT FROM s.fact_start
+                  OR r.early_finish IS DISTINCT FROM s.fact_finish)
+           ORDER BY r.op_id"""
+    )
+    columns = [column[0] for column in cur.description]
+    mismatches = [dict(zip(columns, row)) for row in cur.fetchall()]
+
+    if mismatches:
+        print("Mismatches found between planned and actual dates for completed tasks:")
+        return json.dumps(mismatches)
+    return {
+        "message": "No mismatches found between planned and actual dates for completed tasks."
+    }
@@ -0,0 +1,139 @@
+import numpy as np
+
+from ..algorithms.utils import topological_order
+from ..algorithms.windows import release_time
+
+# "beta" - синоним "pert": то же бета-распределение по трем оценкам
+DISTRIBUTIONS = ("triangular", "pert", "beta")
+
+# Верхняя граница порции выборок: матрицы порции занимают chunk_size x n_ops
+MAX_CHUNK_SIZE = 5000
+
+
+class UnknownDistributionError(Exception):
+    pass
+
+
+def _estimate(op, column):
+    value = op.get(column)
+    return op["duration"] if value is None else value
+
+
+# Матрица длительностей (n_samples x n_ops). Работы без оценок
+# optimistic/pessimistic остаются детерминированными
+def sample_durations(operations, order, n_samples, rng) -> np.ndarray:
+    mode = np.array([operations[act]["duration"] for act in order], dtype=float)
+    low = np.array(
+        [_estimate(operations[act], "optimistic_duration") for act in order],
+        dtype=float,
+    )
+    high = np.array(
+        [_estimate(operations[act], "pessimistic_duration") for act in order],
+        dtype=float,
+    )
+    low = np.minimum(low, mode)
+    high = np.maximum(high, mode)
+
+    distributions = np.array(
+        [operations[act].get("distribution") or "triangular" for act in order]
+    )
+    unknown = set(distributions) - set(DISTRIBUTIONS)
+    if unknown:
+        raise UnknownDistributionError(
+            f"Unknown distributions {sorted(unknown)}, expected one of {DISTRIBUTIONS}."
+        )
+
+    durations = np.tile(mode, (n_samples, 1))
+    uncertain = high > low
+
+    triangular = uncertain & (distributions == "triangular")
+    if triangular.any():
+        durations[:, triangular] = rng.triangular(
+            low[triangular],
+            mode[triangular],
+            high[triangular],
+            size=(n_samples, int(triangular.sum())),
+        )
+
+    # PERT (и "beta") - бета-распределение с формой по трем оценкам
+    pert = uncertain & (distributions != "triangular")
+    if pert.any():
+        spread = high[pert] - low[pert]
+        alpha = 1 + 4 * (mode[pert] - low[pert]) / spread
+        beta = 1 + 4 * (high[pert] - mode[pert]) / spread
+        durations[:, pert] = low[pert] + spread * rng.beta(
+            alpha, beta, size=(n_samples, int(pert.sum()))
+        )
+
+    return durations
+
+
+# CPM сразу для всех выборок: цикл по работам в топологическом порядке,
+# векторизация по выборкам
+def batched_cpm(
+    durations, pred_index, succ_index, release=None
+) -> tuple[np.ndarray, np.ndarray]:
+    n_samples, n_ops = durations.shape
+    release = np.zeros(n_ops) if release is None else release
+    early_finish = np.zeros((n_samples, n_ops))
+    for j in range(n_ops):
+        preds = pred_index[j]
+        early_start = early_finish[:, preds].max(axis=1) if preds else 0.0
+        early_finish[:, j] = np.maximum(early_start, release[j]) + durations[:, j]
+
+    makespan = early_finish.max(axis=1)
+
+    late_start = np.zeros((n_samples, n_ops))
+    for j in range(n_ops - 1, -1, -1):
+        succs = succ_index[j]
+        late_finish = late_start[:, succs].min(axis=1) if succs else makespan
+        late_start[:, j] = late_finish - durations[:, j]
+
+    critical = np.isclose(early_finish - durations, late_start)
+    return makespan, critical
+
+
+def monte_carlo_risk(
+    operations, n_samples=1000, seed=None, chunk_size=500, percentiles=(50, 80, 90)
+) -> dict:
+    order = topological_order(operations)
+    if len(order) < len(operations):
+        raise ValueError("The precedence network contains a cycle.")
+
+    position = {act: j for j, act in enumerate(order)}
+    pred_index = [
+        [position[pre] for pre in operations[act]["predecessors"]] for act in order
+    ]
+    succ_index = [
+        [position[succ] for succ in operations[act]["successors"]] for act in order
+    ]
+
+    release = np.array([release_time(operations[act]) for act in order], dtype=float)
+
+    rng = np.random.default_rng(seed)
+    makespans = np.empty(n_samples)
+    critical_counts = np.zeros(len(order))
+
+    # Выборки обрабатываются порциями, чтобы ограничить память
+    chunk_size = min(chunk_size, MAX_CHUNK_SIZE)
+    for offset in range(0, n_samples, chunk_size):
+        end = min(offset + chunk_size, n_samples)
+        durations = sample_durations(operations, order, end - offset, rng)
+        makespan, critical = batched_cpm(durations, pred_index, succ_index, release)
+        makespans[offset:end] = makespan
+        critical_counts += critical.sum(axis=0)
+
+    return {
+        "samples": n_samples,
+        "makespan": {
+            "mean": float(makespans.mean()),
+            "std": float(makespans.std()),
+            **{
+                f"p{q}": float(value)
+                for q, value in zip(percentiles, np.percentile(makespans, percentiles))
+            },
+        },
+        "criticality": {
+            act: float(critical_counts[j] / n_samples) for j, act in enumerate(order)
+        },
+    }
@@ -0,0 +1,122 @@
+import ast
+from collections import defaultdict
+
+import numpy as np
+
+
+class UnknownResourceError(Exception):
+    pass
+
+
+# Индекс загрузки одного ресурса на сжатой оси событий: usage[i] действует
+# на [times[i], times[i + 1]), после последнего события загрузка нулевая.
+# Префиксные суммы дают занятость на отрезке за O(log n), разреженная
+# таблица максимумов - пик за O(log n)
+class UsageIndex:
+    def __init__(self, times, usage):
+        self.times = np.asarray(times, dtype=np.int64)
+        self.usage = np.asarray(usage, dtype=np.int64)
+        lengths = np.diff(self.times)
+        self.busy_prefix = np.concatenate(([0], np.cumsum(self.usage[:-1] * lengths)))
+        self.active = (self.usage > 0).astype(np.int64)
+        self.active_prefix = np.concatenate(
+            ([0], np.cumsum(self.active[:-1] * lengths))
+        )
+
+        self.sparse = [self.usage]
+        width = 1
+        while 2 * width <= len(self.usage):
+            level = self.sparse[-1]
+            self.sparse.append(np.maximum(level[:-width], level[width:]))
+            width *= 2
+
+    @classmethod
+    def from_intervals(cls, intervals):
+        deltas = defaultdict(int)
+        for start, finish, amount in intervals:
+            if finish > start:
+                deltas[start] += amount
+                deltas[finish] -= amount
+        times = sorted(deltas)
+        usage = np.cumsum([deltas[t] for t in times]) if times else []
+        return cls(times, usage)
+
+    def _cumulative(self, prefix, values, x) -> int:
+        i = np.searchsorted(self.times, x, side="right") - 1
+        if i < 0:
+            return 0
+        return int(prefix[i] + values[i] * (x - self.times[i]))
+
+    # Сумма занятых единиц ресурса по времени на [start, end)
+    def busy(self, start, end) -> int:
+        return self._cumulative(self.busy_prefix, self.usage, end) - self._cumulative(
+            self.busy_prefix, self.usage, start
+        )
+
+    # Время без единой занятой единицы на [start, end)
+    def idle_time(self, start, end) -> int:
+        active = self._cumulative(
+            self.active_prefix, self.active, end
+        ) - self._cumulative(self.active_prefix, self.active, start)
+        return (end - start) - active
+
+    def peak(self, start, end) -> int:
+        if end <= start or not len(self.times):
+            return 0
+        left = max(np.searchsorted(self.times, start, side="right") - 1, 0)
+        right = np.searchsorted(self.times, end, side="left") - 1
+        if right < left:
+            return 0
+        level = int(right - left + 1).bit_length() - 1
+        table = self.sparse[level]
+        return int(max(table[left], table[right - (1 << level) + 1]))
+
+
+# Индексы по всем ресурсам по расписанию (ранние сроки работ).
+# Каждое упоминание ресурса у работы - одна единица
+def build_usage_index(operations) -> dict[str, UsageIndex]:
+    intervals = defaultdict(list)
+    for op in operations.values():
+        for r in op["resources"]:
+            intervals[r].append((op["early_start"], op["early_finish"], 1))
+    return {r: UsageIndex.from_intervals(items) for r, items in intervals.items()}
+
+
+def usage_index_from_results(df_results) -> dict[str, UsageIndex]:
+    operations = {
+        row.op_id: {
+            "early_start": row.early_start,
+            "early_finish": row.early_finish,
+            "resources": ast.literal_eval(row.resources),
+        }
+        for row in df_results.itertuples(index=False)
+    }
+    return build_usage_index(operations)
+
+
+# Ресурсы проверяются до расчета: только неизвестный ресурс дает
+# UnknownResourceError, ошибки самого индекса не маскируются
+def resource_usage(index, capacities, start, end, resources=None) -> list[dict]:
+    resources = resources or sorted(capacities)
+    unknown = [r for r in resources if r not in capacities]
+    if unknown:
+        raise UnknownResourceError(f"Resource '{unknown[0]}' does not exist.")
+
+    report = []
+    for r in resources:
+        usage = index.get(r, UsageIndex.from_intervals([]))
+        busy = usage.busy(start, end)
+        capacity = int(capacities[r])
+        length = end - start
+        report.append(
+            {
+                "resource": r,
+                "capacity": capacity,
+                "busy": busy,
+                "average": busy / length,
+                "utilisation": busy / (capacity * length) if capacity else 0.0,
+                "peak": usage.peak(start, end),
+                "idle_time": usage.idle_time(start, end),
+            }
+        )
+    return report
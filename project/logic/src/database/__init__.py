@@ -2,3 +2,6 @@ from .create import *
 from .delete import *
 from .insert import *
 from .export import *
+from .history import *
+from .stream import *
+from .parquet import *
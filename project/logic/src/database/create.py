@@ -1,3 +1,6 @@
+from .history import create_history_tables
+
+
 class NotEmptyDBError(Exception):
     pass
 
@@ -13,7 +16,10 @@ def create_tables(cur) -> None:
                             predecessors TEXT,
                             successors TEXT,
                             resources TEXT,
-                            deadline INT);""",
+                            deadline INT,
+                            optimistic_duration INT,
+                            pessimistic_duration INT,
+                            distribution VARCHAR(16));""",
         "resources": """CREATE TABLE IF NOT EXISTS resources (
                             type VARCHAR(255) PRIMARY KEY,
                             quantity INT);""",
@@ -52,3 +58,7 @@ def create_tables(cur) -> None:
             raise NotEmptyDBError(
                 f"The table {table_name} already exists in the database."
             )
+
+    # Таблицы истории могут уже существовать (их создает и запись расписания),
+    # поэтому они не считаются признаком занятой БД
+    create_history_tables(cur)
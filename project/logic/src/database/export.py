@@ -1,7 +1,56 @@
 import pandas as pd
 
+from .parquet import LIST_COLUMNS, parse_list_column
+
+
 def export_table_to_csv(conn, table_name, output_file) -> None:
     df = pd.read_sql(f"SELECT * FROM {table_name}", conn)
     df.to_csv(output_file, index=False)
 
-    print(f"Data from table '{table_name}' successfully saved into '{output_file}'")
\ No newline at end of file
+    print(f"Data from table '{table_name}' successfully saved into '{output_file}'")
+
+
+RESULT_FIELDS = [
+    "op_id",
+    "duration",
+    "predecessors",
+    "successors",
+    "resources",
+    "early_start",
+    "early_finish",
+    "late_start",
+    "late_finish",
+    "is_critical",
+]
+
+
+# Страница расписания по ключу op_id (keyset): следующая страница начинается
+# после последнего op_id предыдущей, без OFFSET
+def results_page(cur, after=None, limit=1000, fields=None) -> dict:
+    fields = [field for field in RESULT_FIELDS if fields is None or field in fields]
+    if "op_id" not in fields:
+        fields.insert(0, "op_id")
+
+    cur.execute(
+        f"""SELECT {', '.join(fields)} FROM results
+            WHERE %(after)s IS NULL OR op_id > %(after)s
+            ORDER BY op_id
+            LIMIT %(limit)s""",
+        {"after": after, "limit": limit + 1},
+    )
+    rows = cur.fetchall()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    lists = [i for i, field in enumerate(fields) if field in LIST_COLUMNS]
+    items = []
+    for row in rows:
+        item = dict(zip(fields, row))
+        for i in lists:
+            item[fields[i]] = parse_list_column(row[i])
+        items.append(item)
+
+    return {
+        "items": items,
+        "next_after": rows[-1][0] if has_more else None,
+    }
@@ -0,0 +1,188 @@
+from psycopg2.extras import execute_values
+
+# История расписаний: каждая версия хранит только строки, изменившиеся
+# относительно предыдущей версии
+HISTORY_TABLES = {
+    "schedule_versions": """CREATE TABLE IF NOT EXISTS schedule_versions (
+                                version_id SERIAL PRIMARY KEY,
+                                created_at TIMESTAMP NOT NULL DEFAULT now(),
+                                algorithm VARCHAR(64),
+                                makespan INT,
+                                changed_rows INT);""",
+    "schedule_changes": """CREATE TABLE IF NOT EXISTS schedule_changes (
+                                version_id INT REFERENCES schedule_versions ON DELETE CASCADE,
+                                op_id VARCHAR(255),
+                                duration INT,
+                                early_start INT,
+                                early_finish INT,
+                                late_start INT,
+                                late_finish INT,
+                                is_critical BOOLEAN,
+                                is_deleted BOOLEAN NOT NULL DEFAULT FALSE,
+                                PRIMARY KEY (version_id, op_id));
+                            CREATE INDEX IF NOT EXISTS schedule_changes_op_version
+                                ON schedule_changes (op_id, version_id DESC);""",
+}
+
+VERSIONED_COLUMNS = [
+    "duration",
+    "early_start",
+    "early_finish",
+    "late_start",
+    "late_finish",
+    "is_critical",
+]
+
+# Состояние расписания на версию: последняя запись по каждой работе
+STATE_QUERY = """SELECT DISTINCT ON (op_id) *
+                 FROM schedule_changes
+                 WHERE version_id <= {version}
+                 ORDER BY op_id, version_id DESC"""
+
+
+def create_history_tables(cur) -> None:
+    for query in HISTORY_TABLES.values():
+        cur.execute(query)
+
+
+# Таблицы истории создаются только при записи расписания (и в create_tables),
+# чтения без них возвращают пустой результат
+def history_exists(cur) -> bool:
+    cur.execute("SELECT to_regclass('schedule_versions') IS NOT NULL")
+    return cur.fetchone()[0]
+
+
+def latest_version(cur) -> int | None:
+    if not history_exists(cur):
+        return None
+    cur.execute("SELECT MAX(version_id) FROM schedule_versions")
+    return cur.fetchone()[0]
+
+
+def save_schedule_version(cur, rows, algorithm=None) -> int:
+    create_history_tables(cur)
+    previous = latest_version(cur)
+
+    cur.execute("DROP TABLE IF EXISTS schedule_new")
+    cur.execute(
+        f"CREATE TEMP TABLE schedule_new (op_id VARCHAR(255) PRIMARY KEY, "
+        f"{', '.join(f'{col} BOOLEAN' if col == 'is_critical' else f'{col} INT' for col in VERSIONED_COLUMNS)})"
+    )
+    execute_values(
+        cur,
+        f"INSERT INTO schedule_new (op_id, {', '.join(VERSIONED_COLUMNS)}) VALUES %s",
+        rows,
+    )
+
+    makespan = max((row[3] for row in rows), default=0)
+    cur.execute(
+        "INSERT INTO schedule_versions (algorithm, makespan) VALUES (%s, %s) RETURNING version_id",
+        (algorithm, makespan),
+    )
+    version = cur.fetchone()[0]
+
+    columns = ", ".join(VERSIONED_COLUMNS)
+    new_columns = ", ".join(f"n.{col}" for col in VERSIONED_COLUMNS)
+    old_columns = ", ".join(f"p.{col}" for col in VERSIONED_COLUMNS)
+    previous_state = STATE_QUERY.format(version=int(previous or 0))
+
+    # Новые и изменившиеся работы
+    cur.execute(
+        f"""INSERT INTO schedule_changes (version_id, op_id, {columns})
+            SELECT %s, n.op_id, {new_columns}
+            FROM schedule_new n
+            LEFT JOIN ({previous_state}) p ON p.op_id = n.op_id AND NOT p.is_deleted
+            WHERE p.op_id IS NULL OR ({new_columns}) IS DISTINCT FROM ({old_columns})""",
+        (version,),
+    )
+    changed_rows = cur.rowcount
+
+    # Удаленные работы
+    cur.execute(
+        f"""INSERT INTO schedule_changes (version_id, op_id, is_deleted)
+            SELECT %s, p.op_id, TRUE
+            FROM ({previous_state}) p
+            LEFT JOIN schedule_new n ON n.op_id = p.op_id
+            WHERE n.op_id IS NULL AND NOT p.is_deleted""",
+        (version,),
+    )
+    changed_rows += cur.rowcount
+
+    cur.execute(
+        "UPDATE schedule_versions SET changed_rows = %s WHERE version_id = %s",
+        (changed_rows, version),
+    )
+    cur.execute("DROP TABLE schedule_new")
+
+    print(f"Schedule version {version} saved, {changed_rows} rows changed.")
+    return version
+
+
+def list_schedule_versions(cur) -> list[dict]:
+    if not history_exists(cur):
+        return []
+    cur.execute(
+        """SELECT version_id, created_at, algorithm, makespan, changed_rows
+           FROM schedule_versions
+           ORDER BY version_id DESC"""
+    )
+    columns = [column[0] for column in cur.description]
+    return [dict(zip(columns, row)) for row in cur.fetchall()]
+
+
+# Восстановление расписания версии из цепочки изменений:
+# op_id -> значения VERSIONED_COLUMNS, удаленные работы не входят
+def schedule_at_version(cur, version) -> dict:
+    if not history_exists(cur):
+        raise KeyError(f"Schedule version {version} does not exist.")
+    cur.execute("SELECT 1 FROM schedule_versions WHERE version_id = %s", (version,))
+    if cur.fetchone() is None:
+        raise KeyError(f"Schedule version {version} does not exist.")
+
+    cur.execute(
+        f"""SELECT op_id, {', '.join(VERSIONED_COLUMNS)}
+            FROM ({STATE_QUERY.format(version='%s')}) state
+            WHERE NOT is_deleted""",
+        (version,),
+    )
+    return {row[0]: tuple(row[1:]) for row in cur.fetchall()}
+
+
+# Разница двух версий считается в БД: сдвиги работ и изменение длительности проекта
+def schedule_diff(cur, from_version, to_version) -> dict:
+    if not history_exists(cur):
+        raise KeyError(f"Schedule versions {[from_version, to_version]} do not exist.")
+    cur.execute(
+        "SELECT version_id, makespan FROM schedule_versions WHERE version_id IN (%s, %s)",
+        (from_version, to_version),
+    )
+    makespans = dict(cur.fetchall())
+    missing = [v for v in (from_version, to_version) if v not in makespans]
+    if missing:
+        raise KeyError(f"Schedule versions {missing} do not exist.")
+
+    cur.execute(
+        f"""SELECT COALESCE(b.op_id, a.op_id) AS op_id,
+                   a.early_start AS from_start,
+                   b.early_start AS to_start,
+                   b.early_start - a.early_start AS shift,
+                   b.early_finish - a.early_finish AS finish_shift,
+                   (a.op_id IS NULL OR a.is_deleted) AS added,
+                   (b.op_id IS NULL OR b.is_deleted) AS removed
+            FROM ({STATE_QUERY.format(version='%(from)s')}) a
+            FULL JOIN ({STATE_QUERY.format(version='%(to)s')}) b ON a.op_id = b.op_id
+            WHERE (a.is_deleted, a.early_start, a.early_finish)
+                  IS DISTINCT FROM (b.is_deleted, b.early_start, b.early_finish)
+              AND NOT (COALESCE(a.is_deleted, TRUE) AND COALESCE(b.is_deleted, TRUE))
+            ORDER BY op_id""",
+        {"from": from_version, "to": to_version},
+    )
+    columns = [column[0] for column in cur.description]
+    changes = [dict(zip(columns, row)) for row in cur.fetchall()]
+
+    return {
+        "from_version": from_version,
+        "to_version": to_version,
+        "makespan_delta": makespans[to_version] - makespans[from_version],
+        "changes": changes,
+    }
@@ -4,6 +4,8 @@ from psycopg2.extensions import register_adapter, AsIs
 import pandas as pd
 import numpy as np
 
+from .history import save_schedule_version
+
 register_adapter(np.int64, AsIs)
 register_adapter(np.int32, AsIs)
 register_adapter(np.float64, AsIs)
@@ -15,6 +17,12 @@ class IncompatibleColumnsError(Exception):
     pass
 
 
+# Необязательные столбцы: если их нет в файле, они заполняются NULL
+OPTIONAL_COLUMNS = {
+    "operations": ["optimistic_duration", "pessimistic_duration", "distribution"],
+}
+
+
 # Из файла csv
 def insert_from_csv(cur, csv_file, table_name) -> None:
     # Проверка таблицы на чистоту. Если не чистая, то чистим и загружаем данные
@@ -30,7 +38,10 @@ def insert_from_csv(cur, csv_file, table_name) -> None:
     df = pd.read_csv(csv_file)
     df = df.astype(object).where(pd.notna(df), None)
 
-    missing_columns = [col for col in columns if col not in df.columns]
+    optional_columns = OPTIONAL_COLUMNS.get(table_name, [])
+    missing_columns = [
+        col for col in columns if col not in df.columns and col not in optional_columns
+    ]
     if missing_columns:
         print(
             f"Attention! In file {csv_file} missing columns: {', '.join(missing_columns)}"
@@ -40,6 +51,10 @@ def insert_from_csv(cur, csv_file, table_name) -> None:
             f"Columns {missing_columns} are missing in the file {csv_file}."
         )
 
+    for col in optional_columns:
+        if col in columns and col not in df.columns:
+            df[col] = None
+
     if count > 0:
         print(
             f"Table {table_name} is not empty. Clearing the table before uploading new data."
@@ -88,11 +103,9 @@ def insert_manually(cur, table_name) -> None:
         data_to_insert.append(tuple(row_data))
 
 
-# Результаты
-def insert_results_to_table(cur, operations) -> None:
-    # Очистка таблицы результатов
-    cur.execute("DELETE FROM results")
-
+# Результаты. Вместе с таблицей results сохраняется версия расписания
+# (только изменившиеся строки) в одной транзакции
+def insert_results_to_table(cur, operations, algorithm=None) -> int:
     # Столбцы из results
     cur.execute(
         "SELECT column_name FROM information_schema.columns WHERE table_name = 'results' AND table_schema = 'public'"
@@ -100,6 +113,7 @@ def insert_results_to_table(cur, operations) -> None:
     columns = [row[0] for row in cur.fetchall()]
 
     values = []
+    versioned = []
     for op_id, op in operations.items():
         row_data = [
             op_id,
@@ -114,9 +128,19 @@ def insert_results_to_table(cur, operations) -> None:
             op["is_critical"],
         ]
         values.append(tuple(row_data))
-
-    placeholders = ", ".join(["%s"] * len(columns))
-    query = f"INSERT INTO results ({', '.join(columns)}) VALUES ({placeholders})"
-    cur.executemany(query, values)
+        versioned.append((op_id, row_data[1], *row_data[5:]))
+
+    cur.execute("BEGIN")
+    try:
+        # Очистка таблицы результатов
+        cur.execute("DELETE FROM results")
+        query = f"INSERT INTO results ({', '.join(columns)}) VALUES %s"
+        execute_values(cur, query, values)
+        version = save_schedule_version(cur, versioned, algorithm)
+    except Exception:
+        cur.execute("ROLLBACK")
+        raise
+    cur.execute("COMMIT")
 
     print(f"Data successfully saved into table 'results'.")
+    return version
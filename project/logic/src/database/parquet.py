@@ -0,0 +1,81 @@
+import ast
+
+from .stream import copy_rows
+
+# Столбцы со связями и ресурсами: в БД хранятся текстом (repr списка),
+# в Parquet - списками строк
+LIST_COLUMNS = {"predecessors", "successors", "resources"}
+BATCH_SIZE = 65_536
+# Типы Arrow по типам столбцов Postgres. Сам pyarrow импортируется
+# при первой загрузке или выгрузке Parquet
+ARROW_TYPES = {"integer": "int64", "boolean": "bool_"}
+
+
+def _to_text(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, (list, tuple)):
+        return repr(list(value))
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def _parquet_rows(parquet_file):
+    for batch in parquet_file.iter_batches(batch_size=BATCH_SIZE):
+        columns = [column.to_pylist() for column in batch.columns]
+        for row in zip(*columns):
+            yield [_to_text(value) for value in row]
+
+
+# Загрузка Parquet по пакетам строк через тот же COPY, что и для csv
+def insert_from_parquet(cur, source, table_name) -> int:
+    import pyarrow.parquet as pq
+
+    parquet_file = pq.ParquetFile(source)
+    header = parquet_file.schema_arrow.names
+    return copy_rows(cur, header, _parquet_rows(parquet_file), table_name)
+
+
+def parse_list_column(value):
+    if value is None:
+        return None
+    return [str(item) for item in ast.literal_eval(value)]
+
+
+def _arrow_schema(columns):
+    import pyarrow as pa
+
+    fields = []
+    for name, data_type in columns:
+        if name in LIST_COLUMNS:
+            fields.append(pa.field(name, pa.list_(pa.string())))
+        else:
+            arrow_type = getattr(pa, ARROW_TYPES.get(data_type, "string"))
+            fields.append(pa.field(name, arrow_type()))
+    return pa.schema(fields)
+
+
+# Выгрузка таблицы в Parquet пакетами: списки связей пишутся списочными столбцами
+def export_table_to_parquet(conn, table_name, output_file) -> None:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    with conn.cursor() as cur:
+        cur.execute(
+            "SELECT column_name, data_type FROM information_schema.columns "
+            "WHERE table_name = %s AND table_schema = 'public' ORDER BY ordinal_position",
+            (table_name,),
+        )
+        schema = _arrow_schema(cur.fetchall())
+
+        cur.execute(f"SELECT {', '.join(schema.names)} FROM {table_name}")
+        with pq.ParquetWriter(output_file, schema) as writer:
+            while rows := cur.fetchmany(BATCH_SIZE):
+                columns = [list(column) for column in zip(*rows)]
+                for i, name in enumerate(schema.names):
+                    if name in LIST_COLUMNS:
+                        columns[i] = [parse_list_column(value) for value in columns[i]]
+                writer.write_batch(pa.record_batch(columns, schema=schema))
+
+    print(f"Data from table '{table_name}' successfully saved into '{output_file}'")
@@ -0,0 +1,201 @@
+import csv
+import io
+
+from .insert import IncompatibleColumnsError, OPTIONAL_COLUMNS
+
+# Сколько ошибок в строках собирается до остановки загрузки
+MAX_ROW_ERRORS = 50
+# Как часто печатается прогресс загрузки
+PROGRESS_ROWS = 100_000
+
+TRUE_VALUES = {"true", "t", "1", "yes", "y", "on"}
+FALSE_VALUES = {"false", "f", "0", "no", "n", "off"}
+# Пропуски, которые pandas читал как NULL
+NULL_VALUES = {"", "None", "NaN", "nan", "NULL", "null", "NA", "N/A", "<NA>"}
+
+
+class InvalidRowsError(Exception):
+    def __init__(self, errors):
+        self.errors = errors
+        super().__init__("; ".join(errors))
+
+
+# Приведение значений к виду, который принимает COPY. Целые, записанные
+# pandas как 5.0, допускаются
+def _integer(value) -> str:
+    number = float(value)
+    if not number.is_integer():
+        raise ValueError(value)
+    return str(int(number))
+
+
+def _boolean(value) -> str:
+    value = value.strip().lower()
+    if value not in TRUE_VALUES | FALSE_VALUES:
+        raise ValueError(value)
+    return value
+
+
+PARSERS = {"integer": _integer, "boolean": _boolean}
+
+
+# Поток для COPY: строки csv отдаются кусками по запросу psycopg2,
+# поэтому файл целиком в памяти не держится
+class _CopyStream:
+    def __init__(self, lines):
+        self._lines = lines
+        self._pending = ""
+
+    def read(self, size=-1):
+        chunks = [self._pending]
+        length = len(self._pending)
+        for line in self._lines:
+            chunks.append(line)
+            length += len(line)
+            if 0 <= size <= length:
+                break
+        data = "".join(chunks)
+        if size < 0:
+            self._pending = ""
+            return data
+        self._pending = data[size:]
+        return data[:size]
+
+
+# Первичный ключ таблицы: повторы ищутся при чтении, а не нарушением
+# ограничения в COPY
+KEY_QUERY = """SELECT kcu.column_name
+               FROM information_schema.table_constraints tc
+               JOIN information_schema.key_column_usage kcu
+                 ON kcu.constraint_name = tc.constraint_name
+                AND kcu.table_schema = tc.table_schema
+               WHERE tc.table_name = %s AND tc.table_schema = 'public'
+                 AND tc.constraint_type = 'PRIMARY KEY'
+               ORDER BY kcu.ordinal_position"""
+
+
+class _RowReader:
+    def __init__(
+        self, reader, header, columns, types, table_name, location=None, key=()
+    ):
+        self.reader = reader
+        self.location = location
+        self.header = header
+        self.positions = [header.index(col) for col in columns]
+        self.parsers = [(col, PARSERS.get(types[col])) for col in columns]
+        self.table_name = table_name
+        self.key = [columns.index(col) for col in key if col in columns]
+        self.seen = set()
+        self.rows = 0
+        self.errors = []
+        self.error = None
+
+    def _parse(self, where, row) -> tuple[list, list]:
+        if len(row) != len(self.header):
+            return [], [f"{where}: expected {len(self.header)} fields, got {len(row)}"]
+        values = []
+        errors = []
+        for (col, parser), i in zip(self.parsers, self.positions):
+            value = row[i]
+            if value.strip() in NULL_VALUES:
+                value = None
+            elif parser is not None:
+                try:
+                    value = parser(value)
+                except ValueError:
+                    errors.append(f"{where}: invalid value {value!r} in column '{col}'")
+            values.append(value)
+
+        if self.key and not errors:
+            key = tuple(values[i] for i in self.key)
+            names = ", ".join(self.parsers[i][0] for i in self.key)
+            if None in key:
+                errors.append(f"{where}: missing value in key column '{names}'")
+            elif key in self.seen:
+                value = key[0] if len(key) == 1 else key
+                errors.append(
+                    f"{where}: duplicate value {value!r} in key column '{names}'"
+                )
+            else:
+                self.seen.add(key)
+        return values, errors
+
+    # Строки проверяются по мере чтения; ошибки копятся, а исключения
+    # источника сохраняются и поднимаются после завершения COPY
+    def lines(self):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        try:
+            for index, row in enumerate(self.reader, start=1):
+                if not row:
+                    continue
+                where = self.location() if self.location else f"Row {index}"
+                values, errors = self._parse(where, row)
+                if errors:
+                    self.errors.extend(errors)
+                    if len(self.errors) >= MAX_ROW_ERRORS:
+                        return
+                    continue
+                if self.errors:
+                    continue
+
+                writer.writerow(values)
+                self.rows += 1
+                if self.rows % PROGRESS_ROWS == 0:
+                    print(
+                        f"{self.rows} rows streamed into the table {self.table_name}."
+                    )
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        except (csv.Error, UnicodeDecodeError) as e:
+            self.errors.append(f"{self.location() if self.location else 'Input'}: {e}")
+        except Exception as e:
+            self.error = e
+
+
+# Потоковая загрузка строк через COPY: заголовок сверяется со столбцами таблицы,
+# строки проверяются по типам столбцов. Вызывающий код управляет транзакцией
+def copy_rows(cur, header, reader, table_name, location=None) -> int:
+    cur.execute(
+        "SELECT column_name, data_type FROM information_schema.columns "
+        "WHERE table_name = %s AND table_schema = 'public' ORDER BY ordinal_position",
+        (table_name,),
+    )
+    types = dict(cur.fetchall())
+
+    header = [col.strip() for col in header]
+    optional_columns = OPTIONAL_COLUMNS.get(table_name, [])
+    missing_columns = [
+        col for col in types if col not in header and col not in optional_columns
+    ]
+    if missing_columns:
+        raise IncompatibleColumnsError(
+            f"Columns {missing_columns} are missing in the uploaded file."
+        )
+
+    cur.execute(KEY_QUERY, (table_name,))
+    key = [row[0] for row in cur.fetchall()]
+
+    columns = [col for col in types if col in header]
+    rows = _RowReader(reader, header, columns, types, table_name, location, key)
+
+    cur.execute(f"TRUNCATE TABLE {table_name} CASCADE")
+    cur.copy_expert(
+        f"COPY {table_name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+        _CopyStream(rows.lines()),
+    )
+
+    if rows.error is not None:
+        raise rows.error
+    if rows.errors:
+        raise InvalidRowsError(rows.errors)
+
+    print(f"{rows.rows} rows have been streamed into the table {table_name}.")
+    return rows.rows
+
+
+def insert_from_stream(cur, text_stream, table_name) -> int:
+    reader = csv.reader(text_stream)
+    header = next(reader, [])
+    return copy_rows(cur, header, reader, table_name, lambda: f"Line {reader.line_num}")
@@ -1 +1,11 @@
-from .gantt_chart import *
\ No newline at end of file
+from importlib import import_module
+
+# matplotlib загружается при первом обращении к функциям построения графиков,
+# а не при импорте пакета
+__all__ = ["plot_gantt_chart", "plot_gantt_and_resource_chart"]
+
+
+def __getattr__(name):
+    if name in __all__:
+        return getattr(import_module(".gantt_chart", __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
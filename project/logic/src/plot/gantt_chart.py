@@ -31,6 +31,7 @@ def plot_gantt_chart(results, save_path: str) -> None:
     plt.ylabel("Tasks")
     plt.title("Gantt Chart")
     plt.savefig(save_path)
+    plt.close()
 
 
 def plot_gantt_and_resource_chart(results, resources, save_path: str) -> None:
@@ -112,3 +113,4 @@ def plot_gantt_and_resource_chart(results, resources, save_path: str) -> None:
     plt.tight_layout()
     plt.subplots_adjust(right=0.85)
     plt.savefig(save_path)
+    plt.close()
@@ -0,0 +1,69 @@
+import random
+
+from logic.src.algorithms import ResourceProfile, resource_capacities
+
+
+# Случайная сеть с ресурсами: связи только к недавним работам, каждое
+# упоминание ресурса - одна единица
+def random_project(n=40, seed=0, n_resources=3, capacity=(2, 3), duration=(1, 9)):
+    rnd = random.Random(seed)
+    ids = [f"A{i}" for i in range(n)]
+    operations = {
+        act: {
+            "duration": rnd.randint(*duration),
+            "predecessors": set(),
+            "successors": set(),
+            "resources": [],
+            "early_start": 0,
+            "early_finish": 0,
+            "late_start": 0,
+            "late_finish": 0,
+            "is_critical": False,
+            "release_time": 0,
+            "deadline": 0,
+        }
+        for act in ids
+    }
+    for j, act in enumerate(ids):
+        for i in rnd.sample(range(max(0, j - 8), j), min(j, rnd.randint(0, 3))):
+            operations[act]["predecessors"].add(ids[i])
+            operations[ids[i]]["successors"].add(act)
+        operations[act]["resources"] = [
+            f"R{rnd.randrange(n_resources)}" for _ in range(rnd.randint(0, 2))
+        ]
+    capacities = {f"R{k}": rnd.randint(*capacity) for k in range(n_resources)}
+    return operations, capacities
+
+
+def makespan(operations):
+    return max(op["early_finish"] for op in operations.values())
+
+
+def assert_feasible(operations, capacities):
+    profile = ResourceProfile(resource_capacities(capacities))
+    for act, op in operations.items():
+        assert op["early_finish"] == op["early_start"] + op["duration"]
+        for pre in op["predecessors"]:
+            assert operations[pre]["early_finish"] <= op["early_start"], (pre, act)
+        profile.add(op["early_start"], op["early_finish"], op["resources"])
+    assert not any(profile.conflicts().values())
+
+
+# Несколько независимых сетей со своими ресурсами в одном проекте;
+# порядок работ перемешан, чтобы компоненты шли вперемешку
+def multi_component_project(parts=4, n=15, seed=0, **kwargs):
+    rnd = random.Random(seed)
+    operations = {}
+    capacities = {}
+    for k in range(parts):
+        part, part_capacities = random_project(n=n, seed=seed * parts + k, **kwargs)
+        name = {act: f"C{k}{act}" for act in part}
+        for act, op in part.items():
+            op["predecessors"] = {name[pre] for pre in op["predecessors"]}
+            op["successors"] = {name[succ] for succ in op["successors"]}
+            op["resources"] = [f"C{k}{r}" for r in op["resources"]]
+            operations[name[act]] = op
+        capacities.update({f"C{k}{r}": q for r, q in part_capacities.items()})
+    order = list(operations)
+    rnd.shuffle(order)
+    return {act: operations[act] for act in order}, capacities
@@ -0,0 +1,53 @@
+from itertools import permutations
+
+import pytest
+
+from logic.src.algorithms import (
+    ResourceProfile,
+    lower_bounds,
+    optimality_gap,
+    serial_sgs,
+)
+from tests.instances import random_project
+
+
+# Оптимум перебором: среди расписаний SSGS по всем допустимым спискам работ
+# есть оптимальное
+def brute_force_optimum(operations, capacities):
+    best = None
+    for order in permutations(operations):
+        position = {act: i for i, act in enumerate(order)}
+        if any(
+            position[pre] > position[act]
+            for act in order
+            for pre in operations[act]["predecessors"]
+        ):
+            continue
+        starts = serial_sgs(operations, list(order), ResourceProfile(capacities))
+        duration = max(starts[act] + operations[act]["duration"] for act in order)
+        best = duration if best is None else min(best, duration)
+    return best
+
+
+def test_bounds_on_a_single_machine():
+    operations, _ = random_project(n=3, seed=0)
+    for op, duration in zip(operations.values(), (2, 3, 4)):
+        op.update(duration=duration, predecessors=set(), successors=set())
+        op["resources"] = ["R0"]
+    capacities = {"R0": 1}
+
+    bounds = lower_bounds(operations, capacities)
+
+    assert bounds["critical_path"] == 4
+    assert bounds["resource"] == bounds["lower_bound"] == 9
+    assert brute_force_optimum(operations, capacities) == 9
+    assert optimality_gap(9, bounds["lower_bound"]) == 0
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_lower_bound_never_exceeds_optimum(seed):
+    operations, capacities = random_project(n=7, seed=seed, capacity=(2, 2))
+
+    bounds = lower_bounds(operations, capacities)
+
+    assert bounds["lower_bound"] <= brute_force_optimum(operations, capacities)
@@ -0,0 +1,61 @@
+import pytest
+
+from logic.src.algorithms import (
+    copy_operations,
+    cpm,
+    parallel_cpm,
+    parallel_schedule,
+    ssgs,
+)
+from tests.instances import multi_component_project
+
+SCHEDULE_FIELDS = ("early_start", "early_finish", "late_start", "late_finish")
+
+
+def schedule(operations):
+    return {
+        act: tuple(op[field] for field in SCHEDULE_FIELDS)
+        for act, op in operations.items()
+    }
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_parallel_schedule_matches_ssgs(seed):
+    operations, capacities = multi_component_project(seed=seed, capacity=(2, 3))
+    plain = copy_operations(operations)
+
+    _, plain_duration = ssgs(plain, capacities)
+    _, total_duration = parallel_schedule(operations, capacities, "ssgs", workers=1)
+
+    assert total_duration == plain_duration
+    assert schedule(operations) == schedule(plain)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_parallel_cpm_matches_cpm(seed):
+    operations, _ = multi_component_project(seed=seed)
+    plain = copy_operations(operations)
+
+    plain_path, plain_duration = cpm(plain)
+    critical_path, total_duration = parallel_cpm(operations, workers=1)
+
+    assert total_duration == plain_duration
+    assert set(critical_path) == set(plain_path)
+    assert schedule(operations) == schedule(plain)
+
+
+# С директивным сроком в одной компоненте SSGS всей сети выбирает работы
+# по min LFT, и части без сроков должны планироваться по тому же правилу
+@pytest.mark.parametrize("seed", range(10))
+def test_parallel_schedule_matches_ssgs_with_deadlines(seed):
+    operations, capacities = multi_component_project(seed=seed, capacity=(2, 3))
+    cpm(operations)
+    act = min(act for act in operations if act.startswith("C0"))
+    operations[act]["deadline"] = operations[act]["early_finish"]
+    plain = copy_operations(operations)
+
+    _, plain_duration = ssgs(plain, capacities)
+    _, total_duration = parallel_schedule(operations, capacities, "ssgs", workers=1)
+
+    assert total_duration == plain_duration
+    assert schedule(operations) == schedule(plain)
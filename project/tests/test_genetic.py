@@ -0,0 +1,32 @@
+import pytest
+
+from logic.src.algorithms import copy_operations, genetic_algorithm, ssgs
+from tests.instances import assert_feasible, makespan, random_project
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_genetic_is_no_worse_than_ssgs(seed):
+    operations, capacities = random_project(seed=seed)
+    baseline = copy_operations(operations)
+    _, ssgs_duration = ssgs(baseline, capacities, use_pr=True)
+
+    _, total_duration, convergence = genetic_algorithm(
+        operations, capacities, population_size=10, generations=10, seed=seed, workers=1
+    )
+
+    assert total_duration == makespan(operations) <= ssgs_duration
+    assert convergence[-1]["best"] == total_duration
+    assert_feasible(operations, capacities)
+
+
+def test_genetic_is_deterministic_for_a_seed():
+    operations, capacities = random_project(seed=7)
+    first = copy_operations(operations)
+    second = copy_operations(operations)
+
+    genetic_algorithm(first, capacities, generations=5, seed=1, workers=1)
+    genetic_algorithm(second, capacities, generations=5, seed=1, workers=1)
+
+    assert {act: op["early_start"] for act, op in first.items()} == {
+        act: op["early_start"] for act, op in second.items()
+    }
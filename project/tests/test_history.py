@@ -0,0 +1,92 @@
+import os
+import uuid
+
+import pytest
+
+from logic.src.database import (
+    latest_version,
+    list_schedule_versions,
+    save_schedule_version,
+    schedule_at_version,
+    schedule_diff,
+)
+
+psycopg2 = pytest.importorskip("psycopg2")
+
+
+# Нужен Postgres из переменных окружения приложения (DB_HOST и др.);
+# таблицы создаются во временной схеме и удаляются после теста
+@pytest.fixture
+def cur():
+    if "DB_HOST" not in os.environ:
+        pytest.skip("DB_HOST is not set")
+    try:
+        conn = psycopg2.connect(
+            host=os.environ["DB_HOST"],
+            port=os.environ.get("DB_PORT", 5432),
+            user=os.environ.get("DB_USER"),
+            password=os.environ.get("DB_PASSWORD"),
+            dbname=os.environ.get("DB_NAME"),
+        )
+    except psycopg2.OperationalError as e:
+        pytest.skip(f"Postgres is not available: {e}")
+    conn.autocommit = True
+    schema = f"test_history_{uuid.uuid4().hex[:8]}"
+    with conn.cursor() as cursor:
+        cursor.execute(f"CREATE SCHEMA {schema}")
+        cursor.execute(f"SET search_path TO {schema}")
+        try:
+            yield cursor
+        finally:
+            cursor.execute(f"DROP SCHEMA {schema} CASCADE")
+    conn.close()
+
+
+# Строки версии: op_id, duration, early_start, early_finish, late_start,
+# late_finish, is_critical
+FIRST = [
+    ("A", 2, 0, 2, 0, 2, True),
+    ("B", 3, 2, 5, 2, 5, True),
+    ("C", 1, 0, 1, 4, 5, False),
+]
+SECOND = [
+    ("A", 2, 0, 2, 0, 2, True),
+    ("B", 3, 3, 6, 3, 6, True),
+    ("D", 4, 2, 6, 2, 6, True),
+]
+
+
+def as_state(rows):
+    return {row[0]: row[1:] for row in rows}
+
+
+def test_history_is_empty_without_tables(cur):
+    assert latest_version(cur) is None
+    assert list_schedule_versions(cur) == []
+    with pytest.raises(KeyError):
+        schedule_diff(cur, 1, 2)
+
+
+def test_restore_and_diff_round_trip(cur):
+    first = save_schedule_version(cur, FIRST, "ssgs")
+    second = save_schedule_version(cur, SECOND, "reschedule")
+
+    assert latest_version(cur) == second
+    assert schedule_at_version(cur, first) == as_state(FIRST)
+    assert schedule_at_version(cur, second) == as_state(SECOND)
+
+    # Изменились B, удалена C, добавлена D; A хранится только в первой версии
+    versions = {v["version_id"]: v for v in list_schedule_versions(cur)}
+    assert versions[second]["changed_rows"] == 3
+
+    diff = schedule_diff(cur, first, second)
+    changes = {change["op_id"]: change for change in diff["changes"]}
+    assert diff["makespan_delta"] == 1
+    assert set(changes) == {"B", "C", "D"}
+    assert changes["B"]["shift"] == 1
+    assert changes["C"]["removed"] and changes["D"]["added"]
+
+    # Повторное сохранение первой версии восстанавливает ее целиком
+    third = save_schedule_version(cur, FIRST, "ssgs")
+    assert schedule_at_version(cur, third) == as_state(FIRST)
+    assert schedule_diff(cur, first, third)["changes"] == []
@@ -0,0 +1,42 @@
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+
+# Бюджет импорта приложения: воркеры gunicorn должны стартовать быстро
+IMPORT_BUDGET = 3.0
+
+SETTINGS_ENV = {
+    "DB_HOST": "localhost",
+    "DB_PORT": "5432",
+    "DB_USER": "test",
+    "DB_PASSWORD": "test",
+    "DB_NAME": "test",
+}
+
+
+def test_app_import_is_fast_and_skips_matplotlib():
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            "import sys, app.main; print('matplotlib' in sys.modules)",
+        ],
+        cwd=PROJECT_DIR,
+        env={**os.environ, **SETTINGS_ENV},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert result.stdout.strip() == "False"
+
+    # Строка importtime: "import time: self [us] | cumulative | имя модуля"
+    cumulative = re.search(r"\|\s*(\d+)\s*\|\s*app\.main$", result.stderr, re.M)
+    assert cumulative is not None
+    assert int(cumulative.group(1)) / 1e6 < IMPORT_BUDGET
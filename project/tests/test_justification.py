@@ -0,0 +1,28 @@
+import pytest
+
+from logic.src.algorithms import justify, ssgs
+from tests.instances import assert_feasible, makespan, random_project
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_justify_keeps_schedule_feasible_and_no_longer(seed):
+    operations, capacities = random_project(seed=seed)
+    ssgs(operations, capacities)
+    before = makespan(operations)
+
+    total_duration, _ = justify(operations, capacities, time_limit=5.0)
+
+    assert total_duration == makespan(operations) <= before
+    assert_feasible(operations, capacities)
+
+
+def test_justify_does_not_move_fixed_operations():
+    operations, capacities = random_project(seed=3)
+    ssgs(operations, capacities)
+    fixed = [act for act in operations if int(act[1:]) % 2 == 0]
+    starts = {act: operations[act]["early_start"] for act in fixed}
+
+    justify(operations, capacities, fixed=fixed, time_limit=5.0)
+
+    assert {act: operations[act]["early_start"] for act in fixed} == starts
+    assert_feasible(operations, capacities)
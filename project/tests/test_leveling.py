@@ -0,0 +1,25 @@
+import pytest
+
+from logic.src.algorithms import level_resources, ssgs
+from tests.instances import assert_feasible, makespan, random_project
+
+
+@pytest.mark.parametrize("objective", ["peak", "variance"])
+@pytest.mark.parametrize("seed", range(10))
+def test_leveling_keeps_capacities(seed, objective):
+    operations, capacities = random_project(n=30, seed=seed, capacity=(2, 3))
+    ssgs(operations, capacities)
+    assert_feasible(operations, capacities)
+    duration = makespan(operations)
+
+    result = level_resources(operations, capacities, objective=objective)
+
+    # Предшествование и мощности соблюдены, длительность проекта не выросла
+    assert_feasible(operations, capacities)
+    assert makespan(operations) <= duration
+    for r, stats in result["after"].items():
+        assert stats["peak"] <= capacities[r]
+    if objective == "peak":
+        assert max(s["peak"] for s in result["after"].values()) <= max(
+            s["peak"] for s in result["before"].values()
+        )
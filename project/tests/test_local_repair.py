@@ -0,0 +1,34 @@
+import pytest
+
+from logic.src.algorithms import downstream_region, local_ssgs, select_tasks, ssgs
+from tests.instances import assert_feasible, random_project
+
+
+def test_select_tasks_intersects_list_and_window():
+    operations = {act: {"early_start": start} for act, start in zip("abc", (0, 5, 7))}
+
+    assert select_tasks(operations, ["a", "b"], (4, 10)) == ["b"]
+    assert select_tasks(operations, [], (4, 10)) == ["b", "c"]
+    assert select_tasks(operations, ["a"]) == ["a"]
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_local_repair_only_moves_the_region(seed):
+    operations, capacities = random_project(seed=seed)
+    ssgs(operations, capacities)
+    # Работа A10 затянулась: ее финиш сдвинулся, последователи не успевают
+    delayed = operations["A10"]
+    delayed["duration"] += 5
+    delayed["early_finish"] = delayed["early_start"] + delayed["duration"]
+    selected = ["A10"]
+    region = downstream_region(operations, selected)
+    starts = {act: op["early_start"] for act, op in operations.items()}
+
+    local_ssgs(operations, capacities, selected)
+
+    assert all(
+        operations[act]["early_start"] == starts[act]
+        for act in operations
+        if act not in region
+    )
+    assert_feasible(operations, capacities)
@@ -0,0 +1,38 @@
+import multiprocessing
+
+from app.metrics import Histogram
+
+
+def _observe_in_child(histogram, values):
+    for value in values:
+        histogram.observe("cpm", value)
+
+
+def series(histogram):
+    lines = histogram.render()
+    count = next(line for line in lines if line.startswith('h_count{stage="cpm"}'))
+    return int(count.rsplit(" ", 1)[1])
+
+
+def test_single_process_histogram():
+    histogram = Histogram("h", "Test histogram.")
+    histogram.observe("cpm", 0.2)
+    histogram.observe("cpm", 2.0)
+
+    assert series(histogram) == 2
+    assert 'h_bucket{stage="cpm",le="0.25"} 1' in histogram.render()
+
+
+def test_histogram_sums_processes_through_directory(tmp_path):
+    histogram = Histogram("h", "Test histogram.", directory=str(tmp_path))
+    histogram.observe("cpm", 0.2)
+
+    context = multiprocessing.get_context("fork")
+    for values in ([0.1, 0.3], [5.0]):
+        process = context.Process(target=_observe_in_child, args=(histogram, values))
+        process.start()
+        process.join()
+
+    # Ряды завершившихся процессов сохраняются, унаследованные не удваиваются
+    assert series(histogram) == 4
+    assert 'h_bucket{stage="cpm",le="0.25"} 2' in histogram.render()
@@ -0,0 +1,47 @@
+import pytest
+
+from logic.src.algorithms import copy_operations, cpm, transitive_reduction
+from tests.instances import random_project
+
+
+def reachable(operations):
+    closure = {}
+    for act in operations:
+        seen = set()
+        stack = list(operations[act]["successors"])
+        while stack:
+            succ = stack.pop()
+            if succ not in seen:
+                seen.add(succ)
+                stack.extend(operations[succ]["successors"])
+        closure[act] = seen
+    return closure
+
+
+def test_redundant_edge_is_removed():
+    operations, _ = random_project(n=3, seed=0)
+    a, b, c = operations
+    for op in operations.values():
+        op["predecessors"], op["successors"] = set(), set()
+    for pre, succ in ((a, b), (b, c), (a, c)):
+        operations[pre]["successors"].add(succ)
+        operations[succ]["predecessors"].add(pre)
+
+    assert transitive_reduction(operations) == 1
+    assert operations[a]["successors"] == {b}
+    assert operations[c]["predecessors"] == {b}
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_reduction_preserves_reachability_and_cpm(seed):
+    operations, _ = random_project(n=60, seed=seed)
+    original = copy_operations(operations)
+
+    transitive_reduction(operations)
+
+    assert reachable(operations) == reachable(original)
+    for act, op in operations.items():
+        assert op["successors"] <= original[act]["successors"]
+        for succ in op["successors"]:
+            assert act in operations[succ]["predecessors"]
+    assert cpm(operations)[1] == cpm(original)[1]
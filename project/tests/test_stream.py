@@ -0,0 +1,61 @@
+import csv
+import io
+from pathlib import Path
+
+import pytest
+
+from logic.src.database import InvalidRowsError, insert_from_stream
+
+TEST_DATA = Path(__file__).resolve().parent.parent / "logic" / "test_data"
+
+CURRENT_STATUS_COLUMNS = [
+    ("op_id", "character varying"),
+    ("fact_start", "integer"),
+    ("fact_finish", "integer"),
+    ("is_done", "boolean"),
+]
+
+
+# Курсор без БД: отдает столбцы и первичный ключ таблицы, сохраняет поток COPY
+class FakeCursor:
+    def __init__(self, columns, key=("op_id",)):
+        self.columns = columns
+        self.key = [(col,) for col in key]
+        self.query = None
+        self.copied = None
+
+    def execute(self, query, params=None):
+        self.query = query
+
+    def fetchall(self):
+        return self.key if "PRIMARY KEY" in self.query else self.columns
+
+    def copy_expert(self, query, stream):
+        self.copied = stream.read()
+
+
+def test_current_status_fixture_uploads_with_nulls():
+    cur = FakeCursor(CURRENT_STATUS_COLUMNS)
+    with open(TEST_DATA / "current_status.csv", newline="") as f:
+        rows = insert_from_stream(cur, f, "current_status")
+
+    copied = list(csv.reader(io.StringIO(cur.copied)))
+    assert rows == len(copied) == 15
+    assert copied[3] == ["TASK2/_/4", "", "", "false"]
+    assert copied[0] == ["TASK1/_/1", "0", "1", "true"]
+
+
+def test_invalid_integer_is_reported():
+    cur = FakeCursor(CURRENT_STATUS_COLUMNS)
+    data = "op_id,fact_start,fact_finish,is_done\nA,soon,1,True\n"
+    with pytest.raises(InvalidRowsError) as error:
+        insert_from_stream(cur, io.StringIO(data), "current_status")
+    assert error.value.errors == ["Line 2: invalid value 'soon' in column 'fact_start'"]
+
+
+def test_duplicate_key_is_reported():
+    cur = FakeCursor(CURRENT_STATUS_COLUMNS)
+    data = "op_id,fact_start,fact_finish,is_done\nA,0,1,True\nB,,,\nA,1,2,True\n"
+    with pytest.raises(InvalidRowsError) as error:
+        insert_from_stream(cur, io.StringIO(data), "current_status")
+    assert error.value.errors == ["Line 4: duplicate value 'A' in key column 'op_id'"]
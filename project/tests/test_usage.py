@@ -0,0 +1,43 @@
+import random
+
+import pytest
+
+from logic.src.analytics import UnknownResourceError, UsageIndex, resource_usage
+
+
+# Загрузка по единицам времени: usage[t] - занятые единицы на [t, t + 1)
+def per_unit_usage(intervals, horizon):
+    usage = [0] * horizon
+    for start, finish, amount in intervals:
+        for t in range(start, finish):
+            usage[t] += amount
+    return usage
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_usage_index_matches_brute_force(seed):
+    rng = random.Random(seed)
+    horizon = 40
+    intervals = []
+    for _ in range(rng.randint(0, 12)):
+        start = rng.randrange(horizon)
+        intervals.append((start, rng.randint(start, horizon), rng.randint(1, 3)))
+
+    index = UsageIndex.from_intervals(intervals)
+    usage = per_unit_usage(intervals, horizon + 5)
+    for start in range(horizon + 5):
+        for end in range(start + 1, horizon + 6):
+            window = usage[start:end] + [0] * (end - len(usage))
+            assert index.busy(start, end) == sum(window)
+            assert index.idle_time(start, end) == window.count(0)
+            assert index.peak(start, end) == max(window)
+
+
+def test_unknown_resource():
+    index = {"crane": UsageIndex.from_intervals([(0, 5, 1)])}
+    with pytest.raises(UnknownResourceError):
+        resource_usage(index, {"crane": 1}, 0, 10, ["crane", "truck"])
+
+    # Ресурс без работ - нулевая загрузка, а не ошибка
+    report = resource_usage(index, {"crane": 1, "truck": 2}, 0, 10, ["truck"])
+    assert report[0]["busy"] == 0 and report[0]["peak"] == 0
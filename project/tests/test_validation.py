@@ -0,0 +1,27 @@
+import pandas as pd
+import pytest
+
+from logic.src.algorithms import InvalidProjectError, validate_resources
+
+
+def test_null_quantity_is_rejected():
+    # Столбец INT с NULL pandas читает как float с NaN
+    df_resources = pd.DataFrame({"type": ["R1", "R2"], "quantity": [2, None]})
+
+    with pytest.raises(InvalidProjectError) as error:
+        validate_resources(df_resources)
+
+    assert error.value.errors == ["Resource 'R2' has invalid quantity nan"]
+
+
+def test_valid_resources_pass():
+    validate_resources(pd.DataFrame({"type": ["R1", "R2"], "quantity": [2, 0]}))
+
+
+def test_negative_and_duplicate_resources_are_reported():
+    df_resources = pd.DataFrame({"type": ["R1", "R1"], "quantity": [1, -1]})
+
+    with pytest.raises(InvalidProjectError) as error:
+        validate_resources(df_resources)
+
+    assert len(error.value.errors) == 2